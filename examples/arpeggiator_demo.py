@@ -4,7 +4,7 @@
 import time
 import synthio
 from synth_setup import synth, knobA, knobB, keys
-from arpeggiator import Arpeggiator, patterns, pattern_names
+from synth_tools.arpeggiator import Arpeggiator, patterns, pattern_names
 
 note = None  # note that was pressed during note_on, if any
 
@@ -45,7 +45,7 @@ while True:
     if key := keys.events.get():
         if key.pressed:
             octaves = (octaves + 1) % 4
-            arp.steps = 1 + octaves  # steps must be 1+
+            arp.oct_range = 1 + octaves
 
     if time.monotonic() - last_print_time > 0.5:
         last_print_time = time.monotonic()
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+
+# Runs on a desktop under CPython with numpy, not on CircuitPython.
+# Renders a gliding wavetable line with an AHR envelope to host_render_demo.wav
+# and prints how long rendering took.
+
+import time
+import wave
+import synth_tools.host  # noqa: F401, first, to stand in for synthio and ulab
+import synthio
+from synth_tools.ahr_envelope import AHREnvelope
+from synth_tools.pitch_glider import Glider
+from synth_tools.wavetable import Wavetable
+
+SAMPLE_RATE = 44100
+
+synth = synthio.Synthesizer(sample_rate=SAMPLE_RATE)
+wavetable1 = Wavetable("wavs/PLAITS02.WAV")
+amp_env = AHREnvelope(0.8, 0.0, attack_time=0.01, release_time=0.2)
+glider = Glider(0.1, 48)
+note = synthio.Note(
+    synthio.midi_to_hz(48),
+    waveform=wavetable1.waveform,
+    amplitude=amp_env.env,
+    bend=glider.lerp,
+)
+
+out = []
+render_secs = 0.0
+for i, midi_note in enumerate((48, 55, 60, 51, 48, 43, 48, 60)):
+    glider.update(midi_note)  # bend from the old note...
+    note.frequency = synthio.midi_to_hz(midi_note)  # ...to the new one
+    wavetable1.wave_pos = i * wavetable1.num_waves / 8
+    amp_env.press()
+    synth.press(note)
+    t = time.perf_counter()
+    out.append(synth.render(SAMPLE_RATE // 4))
+    amp_env.release()
+    synth.release(note)
+    out.append(synth.render(SAMPLE_RATE // 8))
+    render_secs += time.perf_counter() - t
+
+samples = sum(len(buf) for buf in out)
+print("rendered %.2f s of audio in %.3f s" % (samples / SAMPLE_RATE, render_secs))
+
+with wave.open("host_render_demo.wav", "wb") as w:
+    w.setnchannels(1)
+    w.setsampwidth(2)
+    w.setframerate(SAMPLE_RATE)
+    for buf in out:
+        w.writeframes(buf.tobytes())
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+
+# Runs on a desktop under CPython, not on CircuitPython.
+# Drives a StepSequencer from synthetic MIDI clock pulses and checks that
+# Start plays from the top, and that Continue after Stop picks up where
+# playing stopped, mid-bar and at a pattern change of a chain.
+
+from synth_tools.midi_clock import CLOCK, CONTINUE, START, STOP, MidiClockSync
+from synth_tools.sequencer_bench import SimClock
+from synth_tools.step_sequencer import StepSequencer
+
+PULSE_MILLIS = 25  # 100 bpm
+STEP_PULSES = 6  # 24 PPQN / 4 steps per beat
+
+clock = SimClock()
+notes = []
+
+seq = StepSequencer(
+    4, 4, on_func=lambda note, *args: notes.append(note), off_func=lambda *args: None
+)
+seq.scheduler.clock = clock
+seq.add_pattern([(60 + i, 127, 0.5, True) for i in range(4)])
+seq.add_pattern([(70 + i, 127, 0.5, True) for i in range(4)])
+seq.bank.set_chain([0, 1])
+
+sync = MidiClockSync(clock=clock)
+sync.add(seq)
+
+
+def play_steps(steps):
+    """Send the pulses of `steps` steps, updating the sequencer every ms"""
+    for _ in range(steps * STEP_PULSES):
+        sync.handle(CLOCK)
+        for _ in range(PULSE_MILLIS):
+            seq.update()
+            clock.advance(1)
+
+
+def check(label, expected):
+    print("%-26s %s" % (label, notes))
+    assert notes == expected, "expected %s" % expected
+    notes.clear()
+
+
+sync.handle(START)
+play_steps(3)
+check("start, 3 steps:", [60, 61, 62])
+
+sync.handle(STOP)
+clock.advance(1000)
+sync.handle(CONTINUE)
+play_steps(3)
+check("continue mid-bar:", [63, 70, 71])
+
+sync.handle(STOP)
+sync.handle(CONTINUE)
+play_steps(2)
+sync.handle(STOP)  # stopped just as pattern 0 comes round again
+sync.handle(CONTINUE)
+play_steps(2)
+check("continue at bar change:", [72, 73, 60, 61])
+
+sync.handle(STOP)
+sync.handle(START)
+play_steps(2)
+check("start again:", [60, 61])
+
+print("ok")
@@ -5,7 +5,7 @@ import time
 import synthio
 import ulab.numpy as np
 from synth_setup import synth, knobA, knobB, keys
-from step_sequencer import StepSequencer
+from synth_tools.step_sequencer import StepSequencer
 
 bpm = 120
 gate_length = 0.3  #  percent 0-1
@@ -56,8 +56,8 @@ seq.bpm = bpm
 
 # convert our pattern to a sequence for the sequencer
 for i in range(len(pattern_steps)):
-    seq.steps[i][0] = root_note + pattern_steps[i]
-    seq.steps[i][2] = 0.25
+    seq.steps.notes[i] = root_note + pattern_steps[i]
+    seq.steps.gates[i] = 0.25
     print("note:", root_note + pattern_steps[i])
 
 print("seq.steps:", seq.steps)
@@ -9,7 +9,7 @@ import time
 import audiocore
 import audiomixer
 from synth_setup import audio, SAMPLE_RATE, BUFFER_SIZE
-from trig_sequencer import TrigSequencer
+from synth_tools.trig_sequencer import TrigSequencer
 
 bpm = 120
 trig_count = 4
@@ -5,11 +5,11 @@ import time
 import ulab.numpy as np
 import synthio
 from synth_setup import synth, knobA
-from wavetable import Wavetable
+from wavetable import Wavetable, WavetableScanner
 
 wavetable_fname = "/wavs/PLAITS02.WAV"  # from http://waveeditonline.com/
 
-wavetable1 = Wavetable(wavetable_fname)
+wavetable1 = Wavetable(wavetable_fname, preload=True)
 
 midi_note = 48
 note = synthio.Note(synthio.midi_to_hz(midi_note), waveform=wavetable1.waveform)
@@ -20,9 +20,14 @@ wave_lfo = synthio.LFO(rate=0.05, waveform=np.array((0, 32767), dtype=np.int16))
 wave_lfo.scale = wavetable1.num_waves
 synth.blocks.append(wave_lfo)  # this activates LFO when not attached to Note
 
+# scanner copies LFO to wave_pos, only when the position has changed
+scanner = WavetableScanner(resolution=32)
+scanner.add(wavetable1, wave_lfo)
+
+last_print_time = 0
 while True:
-    # regularly copy LFO to wave_pos by hand
-    wavetable1.wave_pos = wave_lfo.value
+    scanner.update()
     wave_lfo.rate = (knobA.value / 65535) * 0.25
-    print("wave_pos:%.2f" % wavetable1.wave_pos)
-    time.sleep(0.01)
+    if time.monotonic() - last_print_time > 0.1:
+        last_print_time = time.monotonic()
+        print("wave_pos:%.2f" % wavetable1.wave_pos)
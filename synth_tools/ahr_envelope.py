@@ -12,32 +12,41 @@ Part of synth_tools.
 
 """
 
-import ulab.numpy as np
 import synthio
-
-LINEAR = 0
-EXPONENTIAL = 1
+from synth_tools.curves import (
+    LINEAR,
+    EXPONENTIAL,  # noqa: F401, re-exported
+    LOGARITHMIC,  # noqa: F401, re-exported
+    S_CURVE,  # noqa: F401, re-exported
+    curve_table,
+)
 
 
 class AHREnvelope:
-    """Simple AHR envelope for use with filters"""
+    """
+    Simple AHR envelope for use with filters.
+
+    `curve_type` is LINEAR, EXPONENTIAL, LOGARITHMIC, S_CURVE or a
+    function mapping 0-1 to 0-1. The curve is a shared lookup table from
+    `curve_table` played by the envelope's LFO, so synthio interpolates it.
+    """
 
     def __init__(
-        self, smax, smin, attack_time=0.1, release_time=0.1, curve_type=LINEAR
+        self,
+        smax,
+        smin,
+        attack_time=0.1,
+        release_time=0.1,
+        curve_type=LINEAR,
+        curve_size=32,
     ):
         self.smax = smax
         self.smin = smin
         self.attack_time = max(0.001, attack_time)
         self.release_time = max(0.001, release_time)
-        self.lerp = synthio.LFO(
-            once=True, waveform=np.array((0, 32767), dtype=np.int16)
-        )
-        if curve_type == LINEAR:
-            lerp = self.lerp
-        else:  #  EXPONENTIAL
-            lerp = synthio.Math(synthio.MathOperation.PRODUCT, self.lerp, self.lerp, 1)
+        self.lerp = synthio.LFO(once=True, waveform=curve_table(curve_type, curve_size))
         self.env = synthio.Math(
-            synthio.MathOperation.CONSTRAINED_LERP, smin, smax, lerp
+            synthio.MathOperation.CONSTRAINED_LERP, smin, smax, self.lerp
         )
 
     def press(self):
@@ -53,3 +62,107 @@ class AHREnvelope:
         self.env.b = self.smin
         self.lerp.rate = 1 / self.release_time
         self.lerp.retrigger()
+
+
+class AHREnvelopePool:
+    """
+    Preallocated pool of `AHREnvelope`, one per voice of polyphony, so no
+    envelopes or blocks are made while playing. `press()` hands out an
+    envelope for a key (a MIDI note number, a synthio.Note, anything) and
+    `release()` releases it for reuse.
+
+    A new key gets a released envelope if there is one, the one released
+    longest ago (``steal="oldest"``) or the quietest (``steal="quietest"``).
+    If all are pressed, one is stolen the same way: the one pressed
+    longest ago, or the one at the lowest level.
+
+    :param int voices: how many envelopes to make
+    :param str steal: how to pick an envelope, "oldest" or "quietest"
+
+    The other arguments are as for `AHREnvelope`.
+    """
+
+    def __init__(
+        self,
+        voices,
+        smax,
+        smin,
+        attack_time=0.1,
+        release_time=0.1,
+        curve_type=LINEAR,
+        steal="oldest",
+    ):
+        if steal not in ("oldest", "quietest"):
+            raise ValueError("steal must be 'oldest' or 'quietest'")
+        self.steal = steal
+        self.envs = [
+            AHREnvelope(smax, smin, attack_time, release_time, curve_type)
+            for _ in range(voices)
+        ]
+        self.keys = [None] * voices  # key each envelope was last pressed for
+        self.pressed = [False] * voices
+        self.when = [0] * voices  # when each was last pressed or released
+        self.clock = 0
+
+    def _level(self, i):
+        """How far envelope `i` is above its minimum, 0-1"""
+        env = self.envs[i]
+        span = env.smax - env.smin
+        return abs(env.env.value - env.smin) / span if span else 0
+
+    def _find(self, key):
+        """Index of the envelope last pressed for `key`, or -1. A loop
+        rather than list.index(), which would allocate a ValueError."""
+        keys = self.keys
+        for i in range(len(keys)):
+            if keys[i] == key:
+                return i
+        return -1
+
+    def _pick(self, pressed):
+        """Pick the best envelope whose pressed state is `pressed`, or -1"""
+        best = -1
+        quietest = self.steal == "quietest"
+        for i in range(len(self.envs)):
+            if self.pressed[i] != pressed:
+                continue
+            if best < 0:
+                best = i
+            elif quietest:
+                if self._level(i) < self._level(best):
+                    best = i
+            elif self.when[i] < self.when[best]:
+                best = i
+        return best
+
+    def press(self, key):
+        """Press an envelope for `key`, returning it. A key already
+        holding an envelope gets the same one back, retriggered."""
+        i = self._find(key)
+        if i < 0:
+            i = self._pick(False)
+            if i < 0:
+                i = self._pick(True)  # all in use, steal one
+        self.keys[i] = key
+        self.pressed[i] = True
+        self.clock += 1
+        self.when[i] = self.clock
+        self.envs[i].press()
+        return self.envs[i]
+
+    def release(self, key):
+        """Release the envelope pressed for `key`, returning it,
+        or None if `key` has none (e.g. it was stolen)"""
+        i = self._find(key)
+        if i < 0 or not self.pressed[i]:
+            return None
+        self.pressed[i] = False
+        self.clock += 1
+        self.when[i] = self.clock
+        self.envs[i].release()
+        return self.envs[i]
+
+    def get(self, key):
+        """Return the envelope for `key`, or None"""
+        i = self._find(key)
+        return self.envs[i] if i >= 0 else None
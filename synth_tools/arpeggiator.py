@@ -11,15 +11,9 @@ Part of synth_tools.
 
 """
 
-import time
-
-try:
-    from supervisor import ticks_ms
-except ImportError:
-
-    def ticks_ms():
-        """stand-in for supervisor.ticks_ms"""
-        return time.monotonic_ns() // 1_000_000
+import random
+from array import array
+from synth_tools.tick_scheduler import TickScheduler
 
 
 patterns = (
@@ -42,48 +36,177 @@ pattern_names = (
     "root",
 )
 
+modes = ("up", "down", "updown", "random", "played", "chord")
+
 
 class Arpeggiator:
-    """ """
+    """
+    Arpeggiator plays the held notes one at a time in a `mode`:
+
+    * "up", "down", "updown": by pitch
+    * "random": a fresh random order each time through
+    * "played": in the order the notes were added (the default)
+    * "chord": the `patterns` chord picked by `set_pattern()`, on the
+      lowest held note
+
+    repeated over `oct_range` octaves, `oct_distance` semitones apart.
+    The whole order is worked out into `sequence` only when the notes,
+    mode or octaves change, and each step just indexes into it.
+
+    :param int rate: notes per beat (1=quarter note, 2=8th note, 4=16th note)
+    :param function on_func: function to call on note-on
+    :param function off_func: function to call on note-off
+    """
 
     def __init__(self, rate, on_func=None, off_func=None):
         self.rate = rate  # 1 = 1/4 note, 2 = 1/8th note, 4 = 16th note
-        self.set_bpm(120)  # FIXME
-        self.oct_distance = 12  # distance between repeats  (Ableton nomenclature)
-        self.oct_range = 1  # max number of self.distance to do (Ableton nomenclature)
-        self.octave = 0  # which arp step we're on, this is confusing with above
+        self.scheduler = TickScheduler()  # when each note happens
+        self.set_bpm(120)
+        self._oct_distance = 12  # distance between repeats  (Ableton nomenclature)
+        self._oct_range = 1  # max number of self.distance to do (Ableton nomenclature)
+        self._mode = "played"  # the order notes were added, as before modes
+        self.pattern = 0  # which of `patterns` "chord" mode plays
         self.on_func = on_func
         self.off_func = off_func
-        self.notes = []  # the list of notes currently pressed
+        self._notes = []  # the notes currently pressed, in the order pressed
+        self._note_set = set()  # the same notes, for fast membership tests
+        self.sequence = array("h")  # every note of the arpeggio, in order
         self.transpose = 0
-        self.i = 0  # where in the notes list
+        self.i = 0  # where in the sequence
         self.gate = 0.5
         self.on = False
         self.held_note = None
-        self.next_millis = 0
         self.held_millis = 0
 
+    @property
+    def step_millis(self):
+        """Time between notes in milliseconds"""
+        return self.scheduler.step_millis
+
+    @property
+    def bpm(self):
+        """Returns bpm, computed"""
+        return 60_000 / self.step_millis / self.rate
+
+    @bpm.setter
+    def bpm(self, bpm):
+        """Sets the internal tempo. step_millis is time between notes"""
+        self.scheduler.step_millis = 60_000 / self.rate / bpm
+
+    @property
+    def playing(self):
+        """True if the arpeggiator is running, like the sequencers"""
+        return self.on
+
     def set_bpm(self, bpm, rate=None):
         """Set BPM and optionally rate"""
+        if rate:
+            self.rate = rate
         self.bpm = bpm
-        self.rate = rate
-        self.step_millis = 60_000 / self.rate / self.bpm
+
+    @property
+    def notes(self):
+        """The notes currently pressed, in the order pressed"""
+        return self._notes
+
+    @notes.setter
+    def notes(self, notes):
+        """Replace all the pressed notes, if they are different"""
+        notes = list(notes)
+        if notes != self._notes:
+            self._notes = notes
+            self._note_set = set(notes)
+            self.rebuild()
+
+    @property
+    def mode(self):
+        """How the notes are ordered, one of `modes`"""
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        if mode not in modes:
+            raise ValueError("unknown arp mode %s" % mode)
+        self._mode = mode
+        self.rebuild()
+
+    @property
+    def oct_range(self):
+        """How many octaves the arpeggio covers"""
+        return self._oct_range
+
+    @oct_range.setter
+    def oct_range(self, oct_range):
+        self._oct_range = max(1, oct_range)
+        self.rebuild()
+
+    @property
+    def oct_distance(self):
+        """Semitones between each octave repeat"""
+        return self._oct_distance
+
+    @oct_distance.setter
+    def oct_distance(self, oct_distance):
+        self._oct_distance = oct_distance
+        self.rebuild()
+
+    def set_pattern(self, pattern):
+        """Pick the chord for "chord" mode, by index or name in `patterns`"""
+        if isinstance(pattern, str):
+            pattern = pattern_names.index(pattern)
+        self.pattern = pattern
+        self.rebuild()
 
     def add_note(self, note):
         """Add a note to the arpeggio"""
-        if note not in self.notes:
-            self.notes.append(note)
+        if note not in self._note_set:
+            self._note_set.add(note)
+            self._notes.append(note)
+            self.rebuild()
 
     def del_note(self, note):
         """Remove a note from the arpeggio"""
-        if note in self.notes:
-            self.notes.remove(note)
-            if self.i >= len(self.notes):
-                self.i = 0
+        if note in self._note_set:
+            self._note_set.remove(note)
+            self._notes.remove(note)
+            self.rebuild()
+
+    def rebuild(self):
+        """Work out `sequence`, the full note order, from the held notes"""
+        mode = self._mode
+        if mode == "played":
+            base = self._notes
+        elif mode == "chord":
+            base = []
+            if self._notes:
+                root = min(self._notes)
+                base = [root + n for n in patterns[self.pattern]]
+        else:
+            base = sorted(self._notes)
+        seq = []
+        for octave in range(self._oct_range):
+            shift = octave * self._oct_distance
+            seq.extend(n + shift for n in base)
+        if mode == "down":
+            seq.reverse()
+        elif mode == "updown" and len(seq) > 2:
+            seq.extend(seq[-2:0:-1])  # back down, not repeating the ends
+        self.sequence = array("h", seq)
+        if mode == "random":
+            self.shuffle()
+        if self.i >= len(seq):
+            self.i = 0
+
+    def shuffle(self):
+        """Shuffle `sequence` in place, for "random" mode"""
+        seq = self.sequence
+        for i in range(len(seq) - 1, 0, -1):
+            j = random.randint(0, i)
+            seq[i], seq[j] = seq[j], seq[i]
 
     def start(self):
         """Start the arpeggiator running"""
-        self.next_millis = ticks_ms()
+        self.scheduler.start()
         self.on = True
 
     def stop(self):
@@ -96,7 +219,7 @@ class Arpeggiator:
 
         if not self.on:
             return
-        now = ticks_ms()
+        now = self.scheduler.clock()
 
         # trigger note-off after gate time
         if self.held_note and now - self.held_millis > 0:
@@ -104,20 +227,45 @@ class Arpeggiator:
             self.held_note = None
 
         # trigger note-on on if time to do so
-        delta_millis = now - self.next_millis
-        if delta_millis >= 0 and len(self.notes) > 0:  # time for new note
-            note = self.notes[self.i] + self.oct_distance * self.octave
-            # print("\t\t\t\t\t", "delta:",delta_millis)
+        if self.scheduler.poll(now) and len(self.sequence) > 0:  # time for new note
+            note = self.next_note()
 
             # trigger new note
             self.on_func(note)
             self.held_note = note  # save for note-off
 
-            # set up when note off and next note happens
-            self.held_millis = now + (self.step_millis * self.gate)
-            self.next_millis = now + self.step_millis - delta_millis // 2
+            # set up when note off happens, from when the note was due
+            self.held_millis = self.scheduler.last_millis + (
+                self.step_millis * self.gate
+            )
 
-            # go to next note
-            self.i = (self.i + 1) % len(self.notes)
-            if self.i == 0:
-                self.octave = (self.octave + 1) % self.oct_range
+    def next_note(self):
+        """Return the current note of the arpeggio and move to the next"""
+        seq = self.sequence
+        note = seq[self.i] + self.transpose
+        # go to next note
+        self.i = (self.i + 1) % len(seq)
+        if self.i == 0 and self._mode == "random":
+            self.shuffle()
+        return note
+
+    def step_events(self, capacity=None):  # pylint: disable=unused-argument
+        """How many events `render_step()` will queue for the next note"""
+        return 2 if self.sequence else 0
+
+    def render_step(self, step_time, queue):
+        """Queue the note-on and note-off of the next note, due at `step_time`"""
+        if not self.sequence:
+            return
+        note = self.next_note()
+        queue.push(step_time, self._note_on, (note,))
+        queue.push(step_time + self.step_millis * self.gate, self._note_off, (note,))
+
+    def _note_on(self, note):
+        self.held_note = note
+        self.on_func(note)
+
+    def _note_off(self, note):
+        if self.held_note == note:
+            self.held_note = None
+        self.off_func(note)
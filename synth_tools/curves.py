@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`curves`
+================================================================================
+
+Curve shapes for envelopes and glides, as cached lookup tables for
+`synthio.LFO` waveforms or as chains of `synthio.Math` blocks.
+
+Part of synth_tools.
+
+"""
+
+import ulab.numpy as np
+import synthio
+
+LINEAR = 0
+EXPONENTIAL = 1
+LOGARITHMIC = 2
+S_CURVE = 3
+
+_shapes = (
+    lambda x: x,  # LINEAR
+    lambda x: x * x,  # EXPONENTIAL, slow start
+    lambda x: 1 - (1 - x) * (1 - x),  # LOGARITHMIC, fast start
+    lambda x: x * x * (3 - 2 * x),  # S_CURVE, smoothstep
+)
+
+_tables = {}  # (shape, size) -> shared table
+
+
+def curve_value(shape, x):
+    """Value 0-1 of curve `shape` at `x`, 0-1. `shape` is one of the
+    curve constants or a function mapping 0-1 to 0-1."""
+    if callable(shape):
+        return shape(x)
+    return _shapes[shape](x)
+
+
+def curve_table(shape, size=32):
+    """
+    Return an int16 table of curve `shape` rising from 0 to 32767, to use
+    as a `synthio.LFO` waveform, which interpolates between its points.
+    Tables are cached by (shape, size) and shared, so do not modify them.
+    LINEAR needs only its two end points, whatever `size` is.
+    """
+    if shape == LINEAR:
+        size = 2
+    key = (shape, size)
+    table = _tables.get(key)
+    if table is None:
+        last = size - 1
+        table = np.array(
+            [int(32767 * curve_value(shape, k / last)) for k in range(size)],
+            dtype=np.int16,
+        )
+        _tables[key] = table
+    return table
+
+
+def curve_block(shape, x):
+    """
+    Return a `synthio.Math` block of curve `shape` at `x`, a block or
+    number, limited to 0-1 first. Only the curve constants can be made
+    this way, not functions.
+    """
+    op = synthio.MathOperation
+    if shape == LINEAR:
+        return synthio.Math(op.CONSTRAINED_LERP, 0, 1, x)
+    if shape == EXPONENTIAL:
+        p = synthio.Math(op.CONSTRAINED_LERP, 0, 1, x)
+        return synthio.Math(op.PRODUCT, p, p, 1)
+    if shape == LOGARITHMIC:  # 1 - (1 - x)**2
+        q = synthio.Math(op.CONSTRAINED_LERP, 1, 0, x)
+        return synthio.Math(op.ADD_SUB, 1, 0, synthio.Math(op.PRODUCT, q, q, 1))
+    if shape == S_CURVE:  # x * x * (3 - 2 * x)
+        p = synthio.Math(op.CONSTRAINED_LERP, 0, 1, x)
+        return synthio.Math(op.PRODUCT, p, p, synthio.Math(op.SCALE_OFFSET, p, -2, 3))
+    raise ValueError("curve_block needs a curve constant")
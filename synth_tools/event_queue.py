@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`event_queue`
+================================================================================
+
+`EventQueue` holds timestamped sequencer events until they are due.
+
+Part of synth_tools.
+
+"""
+
+from synth_tools.tick_scheduler import ticks_ms
+
+
+class EventQueue:
+    """
+    Fixed-capacity, time-sorted ring buffer of ``(when, func, args)``
+    events. Sequencers render upcoming events into it ahead of time, and
+    `dispatch()` calls every event that is due. All storage is allocated
+    up front.
+
+    Without a `now`, `dispatch()` and `ticks_until_next()` read the time
+    from `clock`. Sequencers pass their scheduler's ``now``, so a queue
+    keeps to the same time base as the steps it holds.
+
+    :param int capacity: most events that can be queued at once
+    :param function clock: function returning the current time in ms,
+      ``ticks_ms`` if None
+    """
+
+    def __init__(self, capacity=32, clock=None):
+        self.capacity = capacity
+        self.clock = clock or ticks_ms
+        self.times = [0] * capacity
+        self.funcs = [None] * capacity
+        self.args = [None] * capacity
+        self.head = 0  # index of the earliest event
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def full(self):
+        """True if no more events can be pushed"""
+        return self.count == self.capacity
+
+    def push(self, when, func, args=()):
+        """Queue `func(*args)` to be called at time `when`, in ms.
+        Raises IndexError if the queue is full."""
+        if self.count == self.capacity:
+            raise IndexError("event queue full")
+        cap = self.capacity
+        times, funcs, argss = self.times, self.funcs, self.args
+        # insert from the tail, events mostly arrive in time order
+        i = self.count
+        while i > 0:
+            prev = (self.head + i - 1) % cap
+            if times[prev] <= when:
+                break
+            cur = (self.head + i) % cap
+            times[cur], funcs[cur], argss[cur] = times[prev], funcs[prev], argss[prev]
+            i -= 1
+        cur = (self.head + i) % cap
+        times[cur], funcs[cur], argss[cur] = when, func, args
+        self.count += 1
+
+    def grow(self, capacity):
+        """Make room for `capacity` events, keeping the queued ones.
+        Allocates, so size the queue up front where possible."""
+        if capacity <= self.capacity:
+            return
+        order = [(self.head + k) % self.capacity for k in range(self.count)]
+        spare = capacity - self.count
+        self.times = [self.times[j] for j in order] + [0] * spare
+        self.funcs = [self.funcs[j] for j in order] + [None] * spare
+        self.args = [self.args[j] for j in order] + [None] * spare
+        self.head = 0
+        self.capacity = capacity
+
+    def next_time(self):
+        """When the earliest event is due, or None if empty"""
+        return self.times[self.head] if self.count else None
+
+    def ticks_until_next(self, now=None):
+        """Milliseconds until the earliest event is due, or None if empty"""
+        if not self.count:
+            return None
+        if now is None:
+            now = self.clock()
+        return self.times[self.head] - now
+
+    def dispatch(self, now=None):
+        """Call every event due by `now`, in time order.
+        Returns how many were called."""
+        if now is None:
+            now = self.clock()
+        called = 0
+        while self.count and self.times[self.head] <= now:
+            head = self.head
+            func, args = self.funcs[head], self.args[head]
+            self.funcs[head] = self.args[head] = None
+            self.head = (head + 1) % self.capacity
+            self.count -= 1
+            func(*args)
+            called += 1
+        return called
+
+    def clear(self):
+        """Drop all queued events"""
+        for i in range(self.capacity):
+            self.funcs[i] = self.args[i] = None
+        self.head = 0
+        self.count = 0
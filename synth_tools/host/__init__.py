@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`host`
+================================================================================
+
+Stand-ins for the CircuitPython modules synth_tools uses, so it can run
+under plain CPython on a desktop, e.g. to benchmark or listen to
+`AHREnvelope`, `Glider`, `Wavetable` and the sequencers.
+
+Import this before anything else from synth_tools::
+
+    import synth_tools.host  # installs the stand-ins
+    import synthio
+    from synth_tools.ahr_envelope import AHREnvelope
+
+Only modules that are not already importable are replaced:
+
+* ``synthio`` -> `synth_tools.host.synthio`, a NumPy emulation
+* ``ulab`` and ``ulab.numpy`` -> NumPy, via `synth_tools.host.ulab_numpy`
+* ``micropython`` -> `synth_tools.host.micropython`
+* ``adafruit_wave`` -> CPython's ``wave`` module
+
+Needs NumPy (``pip install numpy``). ``displayio`` and ``vectorio`` are
+not emulated, so `synth_tools.ui.gauge_cluster` still needs Blinka.
+
+Part of synth_tools. Meant to run on a host, under plain CPython.
+
+"""
+
+import sys
+import types
+
+
+def _ulab():
+    from synth_tools.host import ulab_numpy  # pylint: disable=import-outside-toplevel
+
+    ulab = types.ModuleType("ulab")
+    ulab.numpy = ulab_numpy
+    return {"ulab": ulab, "ulab.numpy": ulab_numpy}
+
+
+def _synthio():
+    from synth_tools.host import synthio  # pylint: disable=import-outside-toplevel
+
+    return {"synthio": synthio}
+
+
+def _micropython():
+    from synth_tools.host import micropython  # pylint: disable=import-outside-toplevel
+
+    return {"micropython": micropython}
+
+
+def _adafruit_wave():
+    import wave  # pylint: disable=import-outside-toplevel
+
+    return {"adafruit_wave": wave}
+
+
+_stand_ins = (
+    ("ulab", _ulab),
+    ("synthio", _synthio),
+    ("micropython", _micropython),
+    ("adafruit_wave", _adafruit_wave),
+)
+
+
+def install(force=False):
+    """
+    Register the stand-in modules in ``sys.modules``, skipping any module
+    that can already be imported, unless `force`. Returns the names of
+    the modules installed. Called when this package is first imported.
+    """
+    installed = []
+    for name, make in _stand_ins:
+        if not force:
+            try:
+                __import__(name)
+                continue
+            except ImportError:
+                pass
+        modules = make()
+        sys.modules.update(modules)
+        installed.extend(modules)
+    return installed
+
+
+installed = install()
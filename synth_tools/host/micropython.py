@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`micropython`
+================================================================================
+
+Stand-in for the ``micropython`` module under CPython. The compiler
+hints do nothing.
+
+Part of synth_tools. Meant to run on a host, under plain CPython.
+
+"""
+
+
+def const(value):
+    """Return `value`, as MicroPython does at runtime"""
+    return value
+
+
+def native(func):
+    """Return `func` unchanged"""
+    return func
+
+
+viper = native
@@ -0,0 +1,445 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`synthio`
+================================================================================
+
+NumPy emulation of the part of CircuitPython's ``synthio`` that
+synth_tools uses: `LFO` and `Math` blocks, `Envelope`, `Note` and a
+`Synthesizer` that renders to an array instead of playing audio.
+
+Like synthio, blocks are evaluated once per block of `BLOCK_SIZE`
+samples, and a block feeding several others is evaluated only once per
+block. Blocks update while a `Synthesizer` renders, when they are in its
+``blocks`` or used by a playing note. Oscillators use nearest-sample
+lookup, and envelopes ramp linearly across each block.
+
+Not emulated: `Biquad` filters are accepted but do not filter, nor is
+ring modulation applied.
+
+Part of synth_tools. Meant to run on a host, under plain CPython.
+
+"""
+
+import math
+import numpy as np
+
+BLOCK_SIZE = 256  # samples per block, as on CircuitPython
+
+_tick = 0  # number of the block being rendered
+_dt = BLOCK_SIZE / 11025  # seconds per block, set by the rendering synth
+
+_triangle = np.array([0, 32767, 0, -32767], dtype=np.int16)
+_square = np.array([32767] * 32 + [-32767] * 32, dtype=np.int16)
+
+
+def midi_to_hz(midi_note):
+    """Frequency of `midi_note`, which may be fractional"""
+    return 440 * 2 ** ((midi_note - 69) / 12)
+
+
+def voct_to_hz(ctrl):
+    """Frequency of 1V/octave control value `ctrl`, 0 is C0"""
+    return midi_to_hz(12 + 12 * ctrl)
+
+
+def _value(x):
+    """Current value of the block input `x`, a block or a number"""
+    if isinstance(x, _Block):
+        return x.tick()
+    return x
+
+
+class _Block:
+    """Base of `LFO` and `Math`: caches its value for the current block"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._at = -1  # block number _value is for
+
+    @property
+    def value(self):
+        """The value computed for the latest block"""
+        return self._value
+
+    def tick(self):
+        """Compute the value for the current block, once"""
+        if self._at != _tick:
+            self._at = _tick
+            self._value = self._compute()
+        return self._value
+
+    def _compute(self):
+        raise NotImplementedError
+
+
+class LFO(_Block):
+    """
+    Low-frequency oscillator block, looping through `waveform` (int16)
+    `rate` times per second, or going through it once and holding the
+    last point if `once`. Output is ``offset + scale * sample / 32768``.
+    """
+
+    def __init__(
+        self,
+        waveform=None,
+        *,
+        rate=1.0,
+        scale=1.0,
+        offset=0.0,
+        phase_offset=0.0,
+        once=False,
+        interpolate=True,
+    ):
+        super().__init__()
+        self.waveform = waveform
+        self.rate = rate
+        self.scale = scale
+        self.offset = offset
+        self.phase_offset = phase_offset
+        self.once = once
+        self.interpolate = interpolate
+        self.phase = 0.0  # 0-1 position in the waveform, not wrapped
+
+    def retrigger(self):
+        """Restart from the beginning of the waveform"""
+        self.phase = 0.0
+        self._at = -1
+
+    def _compute(self):
+        wave = self.waveform if self.waveform is not None else _triangle
+        size = len(wave)
+        phase = self.phase + _value(self.phase_offset)
+        if self.once:
+            pos = min(max(phase, 0.0), 1.0) * (size - 1)
+            nxt = min(int(pos) + 1, size - 1)
+        else:
+            pos = (phase % 1.0) * size
+            nxt = (int(pos) + 1) % size
+        idx = int(pos)
+        sample = float(wave[idx])
+        if self.interpolate:
+            sample += (float(wave[nxt]) - sample) * (pos - idx)
+        self.phase += _value(self.rate) * _dt
+        if self.once:
+            self.phase = min(max(self.phase, 0.0), 1.0)
+        return _value(self.offset) + _value(self.scale) * sample / 32768
+
+
+class MathOperation:
+    """Operations of a `Math` block"""
+
+    SUM = 0  # a + b + c
+    ADD_SUB = 1  # a + b - c
+    PRODUCT = 2  # a * b * c
+    MUL_DIV = 3  # a * b / c
+    SCALE_OFFSET = 4  # a * b + c
+    OFFSET_SCALE = 5  # (a + b) * c
+    LERP = 6  # a * (1 - c) + b * c
+    CONSTRAINED_LERP = 7  # LERP with c limited to 0-1
+    DIV_ADD = 8  # a / b + c
+    ADD_DIV = 9  # (a + b) / c
+    MID = 10  # median of a, b and c
+    MAX = 11
+    MIN = 12
+    ABS = 13  # abs(a)
+    CONSTRAIN = 14  # a limited to b-c
+    POWER = 15  # a ** b
+
+
+def _div(x, y):
+    return x / y if y else 0.0
+
+
+def _constrained_lerp(a, b, c):
+    c = min(max(c, 0.0), 1.0)
+    return a * (1 - c) + b * c
+
+
+_operations = {
+    MathOperation.SUM: lambda a, b, c: a + b + c,
+    MathOperation.ADD_SUB: lambda a, b, c: a + b - c,
+    MathOperation.PRODUCT: lambda a, b, c: a * b * c,
+    MathOperation.MUL_DIV: lambda a, b, c: _div(a * b, c),
+    MathOperation.SCALE_OFFSET: lambda a, b, c: a * b + c,
+    MathOperation.OFFSET_SCALE: lambda a, b, c: (a + b) * c,
+    MathOperation.LERP: lambda a, b, c: a * (1 - c) + b * c,
+    MathOperation.CONSTRAINED_LERP: _constrained_lerp,
+    MathOperation.DIV_ADD: lambda a, b, c: _div(a, b) + c,
+    MathOperation.ADD_DIV: lambda a, b, c: _div(a + b, c),
+    MathOperation.MID: lambda a, b, c: sorted((a, b, c))[1],
+    MathOperation.MAX: lambda a, b, c: max(a, b, c),
+    MathOperation.MIN: lambda a, b, c: min(a, b, c),
+    MathOperation.ABS: lambda a, b, c: abs(a),
+    MathOperation.CONSTRAIN: lambda a, b, c: min(max(a, b), c),
+    MathOperation.POWER: lambda a, b, c: a**b,
+}
+
+
+class Math(_Block):
+    """Block computing `operation` of its three inputs `a`, `b` and `c`"""
+
+    def __init__(self, operation, a, b=0.0, c=1.0):
+        super().__init__()
+        self.operation = operation
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def _compute(self):
+        func = _operations[self.operation]
+        return func(_value(self.a), _value(self.b), _value(self.c))
+
+
+class Envelope:
+    """Attack-decay-sustain-release amplitude envelope settings.
+    `sustain_level` is relative to `attack_level`."""
+
+    def __init__(
+        self,
+        attack_time=0.1,
+        decay_time=0.05,
+        release_time=0.2,
+        attack_level=1.0,
+        sustain_level=0.8,
+    ):
+        self.attack_time = attack_time
+        self.decay_time = decay_time
+        self.release_time = release_time
+        self.attack_level = attack_level
+        self.sustain_level = sustain_level
+
+
+class FilterMode:
+    """Filter types of a `Biquad`"""
+
+    LOW_PASS = 0
+    HIGH_PASS = 1
+    BAND_PASS = 2
+    NOTCH = 3
+    LOW_SHELF = 4
+    HIGH_SHELF = 5
+    PEAKING_EQ = 6
+
+
+class Biquad:
+    """Filter settings. Accepted and kept, but not applied when rendering."""
+
+    def __init__(self, mode, frequency, Q=0.7071067811865475, A=None):
+        self.mode = mode
+        self.frequency = frequency
+        self.Q = Q  # pylint: disable=invalid-name
+        self.A = A  # pylint: disable=invalid-name
+
+
+class Note:
+    """A note to play. Any numeric parameter may also be a block."""
+
+    def __init__(
+        self,
+        frequency,
+        *,
+        panning=0.0,
+        waveform=None,
+        envelope=None,
+        amplitude=1.0,
+        bend=0.0,
+        filter=None,  # pylint: disable=redefined-builtin
+        ring_frequency=0.0,
+        ring_bend=0.0,
+        ring_waveform=None,
+    ):
+        self.frequency = frequency
+        self.panning = panning
+        self.waveform = waveform
+        self.envelope = envelope
+        self.amplitude = amplitude
+        self.bend = bend
+        self.filter = filter
+        self.ring_frequency = ring_frequency
+        self.ring_bend = ring_bend
+        self.ring_waveform = ring_waveform
+
+
+# envelope stages of a voice
+_ATTACK, _DECAY, _SUSTAIN, _RELEASE = range(4)
+
+
+class _Voice:
+    """Playing state of one pressed or releasing note"""
+
+    def __init__(self, key, note):
+        self.key = key  # what it was pressed as, a Note or a MIDI note
+        self.note = note
+        self.phase = 0.0  # position in the waveform, in samples
+        self.stage = _ATTACK
+        self.level = 0.0  # envelope level at the end of the last block
+        self.release_rate = 0.0  # level drop per second while releasing
+
+    def step_envelope(self, env, dt):
+        """Advance the envelope by `dt` seconds, False once released"""
+        stage = self.stage
+        level = self.level
+        if stage == _ATTACK:
+            peak = env.attack_level
+            if env.attack_time > 0:
+                level += peak / env.attack_time * dt
+            if level >= peak or env.attack_time <= 0:
+                level = peak
+                stage = _DECAY
+        elif stage == _DECAY:
+            sustain = env.sustain_level * env.attack_level
+            if env.decay_time > 0 and level > sustain:
+                level -= (env.attack_level - sustain) / env.decay_time * dt
+            if level <= sustain or env.decay_time <= 0:
+                level = sustain
+                stage = _SUSTAIN
+        elif stage == _RELEASE:
+            level -= self.release_rate * dt
+            if level <= 0:
+                self.level = 0.0
+                return False
+        self.stage = stage
+        self.level = level
+        return True
+
+    def release(self, env):
+        """Start the release stage from the current level"""
+        self.stage = _RELEASE
+        if env.release_time > 0:
+            self.release_rate = max(self.level, 1e-6) / env.release_time
+        else:
+            self.release_rate = math.inf
+
+
+class Synthesizer:
+    """
+    Polyphonic synthesizer that renders blocks of int16 samples on
+    demand with `render()`, interleaved if `channel_count` is 2.
+
+    :param int sample_rate: output sample rate
+    :param int channel_count: 1 for mono, 2 for stereo
+    :param waveform: default int16 waveform of notes, a square wave if None
+    :param envelope: default `Envelope` of notes, on/off if None
+    """
+
+    max_polyphony = 12
+
+    def __init__(
+        self, *, sample_rate=11025, channel_count=1, waveform=None, envelope=None
+    ):
+        self.sample_rate = sample_rate
+        self.channel_count = channel_count
+        self.waveform = waveform
+        self.envelope = envelope
+        self.blocks = []
+        self._voices = []
+        self._ramp = np.arange(1, BLOCK_SIZE + 1) / BLOCK_SIZE
+
+    @property
+    def pressed(self):
+        """Notes currently pressed, not counting releasing ones"""
+        return tuple(v.key for v in self._voices if v.stage != _RELEASE)
+
+    def _env(self, note):
+        return note.envelope or self.envelope or Envelope(0, 0, 0, 1, 1)
+
+    @staticmethod
+    def _notes(notes):
+        if isinstance(notes, (Note, int, float)):
+            return (notes,)
+        return notes
+
+    def press(self, notes=()):
+        """Start playing `notes`, a `Note` or a sequence of them.
+        An int or float is a MIDI note with the default settings."""
+        for key in self._notes(notes):
+            voice = self._find(key)
+            if voice is None:
+                if len(self._voices) >= self.max_polyphony:
+                    continue
+                note = key if isinstance(key, Note) else Note(midi_to_hz(key))
+                self._voices.append(_Voice(key, note))
+            else:  # retrigger, from the current level
+                voice.stage = _ATTACK
+
+    def release(self, notes=()):
+        """Start releasing `notes`"""
+        for key in self._notes(notes):
+            voice = self._find(key)
+            if voice is not None and voice.stage != _RELEASE:
+                voice.release(self._env(voice.note))
+
+    def release_all(self):
+        """Start releasing every pressed note"""
+        self.release(self.pressed)
+
+    def release_then_press(self, release=(), press=()):
+        """Release, then press, as one change"""
+        self.release(release)
+        self.press(press)
+
+    def release_all_then_press(self, press=()):
+        """Release every note, then press `press`"""
+        self.release_all()
+        self.press(press)
+
+    def _find(self, key):
+        for voice in self._voices:
+            if voice.key == key:
+                return voice
+        return None
+
+    def render(self, frames=BLOCK_SIZE):
+        """
+        Render at least `frames` sample frames, in whole blocks of
+        `BLOCK_SIZE`, and return them as an int16 array.
+        """
+        blocks = -(-frames // BLOCK_SIZE)
+        out = np.zeros(blocks * BLOCK_SIZE * self.channel_count, dtype=np.int16)
+        for k in range(blocks):
+            start = k * BLOCK_SIZE * self.channel_count
+            out[start : start + BLOCK_SIZE * self.channel_count] = self._block()
+        return out
+
+    def _block(self):
+        global _tick, _dt  # pylint: disable=global-statement
+        _tick += 1
+        _dt = dt = BLOCK_SIZE / self.sample_rate
+        for block in self.blocks:
+            block.tick()
+        stereo = self.channel_count == 2
+        mix = np.zeros((BLOCK_SIZE, 2) if stereo else BLOCK_SIZE)
+        ramp = self._ramp
+        playing = []
+        for voice in self._voices:
+            note = voice.note
+            start_level = voice.level
+            if not voice.step_envelope(self._env(note), dt):
+                continue
+            playing.append(voice)
+            wave = note.waveform
+            if wave is None:
+                wave = self.waveform if self.waveform is not None else _square
+            size = len(wave)
+            freq = _value(note.frequency) * 2 ** _value(note.bend)
+            step = freq * size / self.sample_rate
+            idx = voice.phase + step * ramp * BLOCK_SIZE - step
+            voice.phase = (voice.phase + step * BLOCK_SIZE) % size
+            samples = np.asarray(wave)[idx.astype(int) % size].astype(float)
+            gain = start_level + (voice.level - start_level) * ramp
+            samples *= gain * _value(note.amplitude)
+            if stereo:
+                pan = _value(note.panning)
+                mix[:, 0] += samples * min(1, 1 - pan)
+                mix[:, 1] += samples * min(1, 1 + pan)
+            else:
+                mix += samples
+            # keep blocks used only by unemulated parts updating
+            _value(note.ring_frequency)
+            _value(note.ring_bend)
+            if note.filter is not None:
+                _value(note.filter.frequency)
+                _value(note.filter.Q)
+        self._voices = playing
+        return np.clip(mix, -32768, 32767).astype(np.int16).ravel()
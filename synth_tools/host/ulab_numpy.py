@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`ulab_numpy`
+================================================================================
+
+Stand-in for ``ulab.numpy`` under CPython: NumPy, plus the few places
+ulab differs that synth_tools relies on.
+
+Part of synth_tools. Meant to run on a host, under plain CPython.
+
+"""
+
+# pylint: disable=wildcard-import,unused-wildcard-import,redefined-builtin
+import numpy
+from numpy import *  # noqa: F403
+
+float = numpy.float64  # ulab's float dtype, gone from NumPy 2
+
+
+def frombuffer(buffer, dtype=float, count=-1, offset=0):
+    """Like ``numpy.frombuffer``, but arrays over a `bytes` are writable
+    copies, as in ulab. Other buffers, like an mmap, are still shared."""
+    arr = numpy.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    if isinstance(buffer, bytes):
+        arr = arr.copy()
+    return arr
@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`master_clock`
+================================================================================
+
+`MasterClock` runs many sequencers from one beat grid.
+
+Part of synth_tools.
+
+"""
+
+from synth_tools.event_queue import EventQueue
+from synth_tools.tick_scheduler import TickScheduler
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+class MasterClock:
+    """
+    One clock for many tracks: `StepSequencer`, `TrigSequencer` and
+    `Arpeggiator` (anything with ``render_step()``, ``step_events()``,
+    ``steps_per_beat`` or ``rate``, ``bpm`` and ``playing``). The clock
+    ticks on a grid fine enough for every track's steps per beat, so all
+    tracks stay locked to the same beats, and their events go into one
+    shared `EventQueue`.
+
+    Which tracks step on each grid tick is worked out when tracks are
+    added, so `update()` reads the time once and compares it to the
+    next due time once, only doing work when something is due. Add the
+    tracks before calling `start()`.
+
+    Ticks are rendered ahead by the largest ``timing_ahead`` of the
+    tracks, so steps nudged early still play early. If the tracks due on
+    a tick need more room than the shared queue has left, say for big
+    ratchets, the queue grows to fit them.
+
+    :param float bpm: tempo in beats per minute
+    :param int queue_size: how many events the shared queue can hold
+    """
+
+    def __init__(self, bpm=120, queue_size=64):
+        self.tracks = []
+        self.grid = 1  # grid ticks per beat
+        self.due = [[]]  # tracks that step on each grid tick of a beat
+        self.tick = 0  # grid tick of the beat that is due next
+        self.scheduler = TickScheduler()
+        self.queue = EventQueue(queue_size, self.scheduler.now)
+        self.playing = False
+        self.next_due = 0  # when update() next has anything to do
+        self.ahead = 0  # how far ahead of the grid to render
+        self._bpm = bpm
+        self.bpm = bpm
+
+    @property
+    def bpm(self):
+        """Tempo in beats per minute"""
+        return self._bpm
+
+    @bpm.setter
+    def bpm(self, bpm):
+        """Set the tempo of the clock and every track"""
+        self._bpm = bpm
+        self.scheduler.step_millis = 60_000 / self.grid / bpm
+        for track in self.tracks:
+            track.bpm = bpm
+        self._update_next_due()
+
+    def add(self, track):
+        """Add `track` to be driven by the clock"""
+        self.tracks.append(track)
+        track.bpm = self._bpm
+        self._build_grid()
+
+    def remove(self, track):
+        """Stop driving `track`"""
+        self.tracks.remove(track)
+        self._build_grid()
+
+    def _build_grid(self):
+        """Find the grid fitting every track and which tracks step on each tick"""
+        grid = 1
+        for track in self.tracks:
+            spb = getattr(track, "steps_per_beat", None) or track.rate
+            grid = grid * spb // _gcd(grid, spb)
+        self.due = [[] for _ in range(grid)]
+        for track in self.tracks:
+            spb = getattr(track, "steps_per_beat", None) or track.rate
+            for tick in range(0, grid, grid // spb):
+                self.due[tick].append(track)
+        self.grid = grid
+        self.tick %= grid
+        self.bpm = self._bpm
+
+    def start(self):
+        """Start the clock and every track from the top of a beat"""
+        self.queue.clear()
+        for track in self.tracks:
+            track.start()
+            track.i = 0
+        self.tick = 0
+        self.scheduler.start()
+        self.playing = True
+        self._update_next_due()
+
+    def stop(self):
+        """Stop the clock and every track"""
+        self.playing = False
+        self.queue.clear()
+        for track in self.tracks:
+            track.stop()
+
+    def _update_next_due(self):
+        ahead = 0
+        for track in self.tracks:
+            ahead = max(ahead, getattr(track, "timing_ahead", 0))
+        self.ahead = ahead
+        next_event = self.queue.next_time()
+        self.next_due = self.scheduler.next_millis - ahead
+        if next_event is not None and next_event < self.next_due:
+            self.next_due = next_event
+
+    def update(self):
+        """Step every track that is due and dispatch due events.
+        Call as frequently as possible."""
+        if not self.playing:
+            return
+        now = self.scheduler.clock()
+        if now < self.next_due:
+            return
+        scheduler = self.scheduler
+        queue = self.queue
+        while scheduler.poll(now, self.ahead):
+            step_time = scheduler.last_millis
+            due = self.due[self.tick]
+            need = len(queue)
+            for track in due:
+                if track.playing:
+                    need += track.step_events()
+            if need > queue.capacity:
+                queue.grow(need)
+            for track in due:
+                if track.playing:
+                    track.render_step(step_time, queue)
+            self.tick = (self.tick + 1) % self.grid
+        queue.dispatch(now)
+        self._update_next_due()
@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`midi_clock`
+================================================================================
+
+`MidiClockSync` slaves sequencers to an external 24 PPQN MIDI clock.
+
+Part of synth_tools.
+
+"""
+
+from synth_tools.tick_scheduler import ticks_ms
+
+PPQN = 24  # MIDI clock pulses per quarter note
+
+CLOCK = 0xF8
+START = 0xFA
+CONTINUE = 0xFB
+STOP = 0xFC
+
+
+class MidiClockSync:
+    """
+    Follow an external MIDI clock. Feed it timestamped clock pulses with
+    `pulse()` (or raw realtime status bytes with `handle()`). It fits a
+    least-squares line of pulse time against pulse number over the last
+    ``window`` pulses, which smooths out pulse jitter, and locks the
+    `TickScheduler` of every added sequencer to that line, so steps land
+    on the estimated beat grid rather than on the jittery pulses.
+
+    Every pulse is also compared to where the previous fit predicted it,
+    giving `jitter_rms` and `jitter_max` in milliseconds.
+
+    Timestamps are passed in, so it can be driven by synthetic pulse
+    streams on a host as well as by ``ticks_ms()``. Pulses without one
+    are stamped with `clock`.
+
+    :param int window: how many recent pulses to fit tempo over
+    :param function clock: function returning the current time in ms,
+      ``ticks_ms`` if None
+    """
+
+    def __init__(self, window=24, clock=None):
+        self.window = window
+        self.clock = clock or ticks_ms
+        self.times = [0.0] * window  # ring of pulse times since start
+        self.count = 0  # pulses since start
+        self.start_millis = 0  # time of the first pulse
+        self.running = False
+        self.waiting = False  # started, waiting for the first pulse
+        self.origin = 0.0  # fitted time of pulse 0, since start_millis
+        self.period = 0.0  # fitted time between pulses
+        self.tracks = []
+        self.positions = []  # each track's place when last stopped
+        self.resume = False  # put tracks back in place on the next pulse
+        self.jitter_rms = 0.0
+        self.jitter_max = 0.0
+        self._jitter_sq = 0.0
+        self._jitter_n = 0
+
+    @property
+    def bpm(self):
+        """Estimated tempo, 0 until there are two pulses"""
+        return 60_000 / (self.period * PPQN) if self.period else 0
+
+    def add(self, track):
+        """Drive `track` (a StepSequencer, TrigSequencer or Arpeggiator)
+        from the clock. Its steps per beat must divide 24."""
+        self.tracks.append(track)
+
+    def remove(self, track):
+        """Stop driving `track`"""
+        self.tracks.remove(track)
+
+    def handle(self, status, now=None):
+        """Handle a MIDI realtime status byte: clock, start, continue or stop"""
+        if status == CLOCK:
+            self.pulse(now)
+        elif status == START:
+            self.start()
+        elif status == CONTINUE:
+            self.start(restart=False)
+        elif status == STOP:
+            self.stop()
+
+    def start(self, restart=True):
+        """MIDI Start: the next pulse is the downbeat, and the tracks start
+        then. If not `restart` (MIDI Continue), tracks carry on from the
+        step and pattern they were at when stopped."""
+        self.count = 0
+        if restart:
+            for track in self.tracks:
+                track.i = 0
+                bank = getattr(track, "bank", None)
+                if bank is not None:
+                    bank.rewind()  # songs start from the top too
+        self.resume = not restart and len(self.positions) == len(self.tracks)
+        self.waiting = True
+        self.running = False
+
+    def stop(self):
+        """MIDI Stop: stop all tracks, remembering their places for Continue"""
+        self.running = self.waiting = False
+        self.positions = [self._position(track) for track in self.tracks]
+        for track in self.tracks:
+            track.stop()
+
+    @staticmethod
+    def _position(track):
+        """Where `track` is: its step, and its pattern and bank state"""
+        bank = getattr(track, "bank", None)
+        if bank is None:
+            return (track.i,)
+        return (track.i, track.steps, bank.chain_pos, bank.current, bank.queued)
+
+    @staticmethod
+    def _restore(track, position):
+        """Put `track` back where `_position` found it"""
+        track.i = position[0]
+        if len(position) > 1:
+            bank = track.bank
+            track.steps = position[1]
+            bank.chain_pos, bank.current, bank.queued = position[2:]
+
+    def reset_stats(self):
+        """Clear the jitter statistics"""
+        self.jitter_rms = self.jitter_max = 0.0
+        self._jitter_sq = 0.0
+        self._jitter_n = 0
+
+    def pulse(self, now=None):
+        """Handle a MIDI clock pulse that arrived at `now` (ms)"""
+        if now is None:
+            now = self.clock()
+        if self.waiting:  # first pulse after start
+            self.waiting = False
+            self.running = True
+            self.start_millis = now
+            for k, track in enumerate(self.tracks):
+                track.start()
+                if self.resume:
+                    self._restore(track, self.positions[k])
+                track.scheduler.start(now)
+            self.resume = False
+        if not self.running:
+            return
+        t = now - self.start_millis
+        n = self.count
+        if n and self.period:
+            self._add_jitter(t - (self.origin + self.period * n))
+        self.times[n % self.window] = t
+        self.count = n + 1
+        if self.fit():
+            self.lock()
+
+    def _add_jitter(self, err):
+        err = abs(err)
+        self.jitter_max = max(self.jitter_max, err)
+        self._jitter_sq += err * err
+        self._jitter_n += 1
+        self.jitter_rms = (self._jitter_sq / self._jitter_n) ** 0.5
+
+    def fit(self):
+        """Fit the pulse line over the window, returns False if too few pulses"""
+        n = min(self.count, self.window)
+        if n < 2:
+            return False
+        first = self.count - n  # pulse number of the oldest in the window
+        times = self.times
+        window = self.window
+        t0 = times[first % window]  # subtract, to keep the sums small
+        mean_x = (n - 1) / 2  # pulse numbers relative to first
+        sum_y = 0.0
+        sum_xy = 0.0
+        for x in range(n):
+            y = times[(first + x) % window] - t0
+            sum_y += y
+            sum_xy += (x - mean_x) * y
+        var_x = n * (n * n - 1) / 12  # sum of (x - mean_x)**2
+        self.period = sum_xy / var_x
+        mean_y = sum_y / n
+        self.origin = t0 + mean_y - self.period * (first + mean_x)
+        return True
+
+    def lock(self):
+        """Lock every track's step grid to the fitted pulse line"""
+        origin = self.start_millis + self.origin
+        for track in self.tracks:
+            spb = getattr(track, "steps_per_beat", None) or track.rate
+            track.scheduler.lock(origin, self.period * (PPQN // spb))
@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`mod_envelope`
+================================================================================
+
+`ModEnvelope` is a Delay-Attack-Hold-Decay-Sustain-Release modulation
+envelope made of synthio blocks, for filters, wavetable position and more.
+
+Part of synth_tools.
+
+"""
+
+import synthio
+from synth_tools.curves import LINEAR, curve_block, curve_table
+
+_MIN_TIME = 0.0005  # shortest stage, in seconds, to keep rates finite
+_OVERRUN = 1.05  # ramps run a little past the stages, so they end exactly
+
+
+class ModEnvelope:
+    """
+    DAHDSR envelope running entirely in synthio blocks. On press, one
+    one-shot `synthio.LFO` ramps linearly through the whole delay,
+    attack, hold and decay time. Each stage maps that ramp to its own
+    progress with a `synthio.Math` block, limited to 0-1, so every stage
+    starts and ends exactly on time however short it is, and is shaped
+    by `curve_block`. The release stage has its own ramp. So Python only
+    runs on `press()` and `release()`, never while a stage plays. Leave a
+    time at 0 to skip its stage; for a plain ADSR leave `delay_time` and
+    `hold_time` at 0.
+
+    `env` is the output block, going from `smin` to `smax` and back. Use
+    it as a note or filter parameter, or add it to ``synth.blocks`` and
+    read `value`, e.g. as a `WavetableScanner` source.
+
+    :param float smax: peak value
+    :param float smin: resting value
+    :param float delay_time: seconds before the attack starts
+    :param float attack_time: seconds to go from `smin` to `smax`
+    :param float hold_time: seconds to stay at `smax`
+    :param float decay_time: seconds to go from `smax` to the sustain level
+    :param float sustain_level: sustain level, 0-1 of the way from smin to smax
+    :param float release_time: seconds to go from the current value to `smin`
+    :param curve_type: curve shape of each stage, one of the curve constants
+    """
+
+    def __init__(
+        self,
+        smax,
+        smin,
+        delay_time=0,
+        attack_time=0.1,
+        hold_time=0,
+        decay_time=0.1,
+        sustain_level=1.0,
+        release_time=0.1,
+        curve_type=LINEAR,
+    ):
+        self.smax = smax
+        self.smin = smin
+        self.delay_time = delay_time
+        self.attack_time = attack_time
+        self.hold_time = hold_time
+        self.decay_time = decay_time
+        self.sustain_level = sustain_level
+        self.release_time = release_time
+        self.curve_type = curve_type
+        op = synthio.MathOperation
+        ramp = curve_table(LINEAR)
+        self.press_lfo = synthio.LFO(once=True, waveform=ramp)
+        self.release_lfo = synthio.LFO(once=True, waveform=ramp)
+        # progress through the attack, and what is left of the decay and release
+        self.attack_pos = synthio.Math(op.SCALE_OFFSET, self.press_lfo, 1, 0)
+        self.decay_left = synthio.Math(op.SCALE_OFFSET, self.press_lfo, -1, 1)
+        self.release_left = synthio.Math(op.SCALE_OFFSET, self.release_lfo, -1, 1)
+        self.attack = synthio.Math(
+            op.CONSTRAINED_LERP, smin, smax, curve_block(curve_type, self.attack_pos)
+        )
+        self.press_env = synthio.Math(
+            op.CONSTRAINED_LERP,
+            smin,
+            self.attack,
+            curve_block(curve_type, self.decay_left),
+        )
+        self.release_curve = curve_block(curve_type, self.release_left)
+        self.env = synthio.Math(op.CONSTRAINED_LERP, smin, smin, 1.0)
+        self.update_stages()
+
+    @property
+    def press_time(self):
+        """Seconds from press to reaching the sustain level"""
+        return self.delay_time + self.attack_time + self.hold_time + self.decay_time
+
+    def update_stages(self):
+        """Recompute the stage timings and levels in place.
+        Call after changing any of the times or levels."""
+        span = max(self.press_time, _MIN_TIME) * _OVERRUN  # ramp length
+        self.press_lfo.rate = 1 / span
+        attack = max(self.attack_time, _MIN_TIME)
+        self.attack_pos.b = span / attack
+        self.attack_pos.c = -self.delay_time / attack
+        self.attack.a = self.smin
+        self.attack.b = self.smax
+        decay = max(self.decay_time, _MIN_TIME)
+        self.decay_left.b = -span / decay
+        self.decay_left.c = (self.press_time - self.decay_time) / decay + 1
+        self.press_env.a = self.smin + (self.smax - self.smin) * self.sustain_level
+        span = max(self.release_time, _MIN_TIME) * _OVERRUN
+        self.release_lfo.rate = 1 / span
+        self.release_left.b = -span / max(self.release_time, _MIN_TIME)
+
+    @property
+    def value(self):
+        """The current envelope value"""
+        return self.env.value
+
+    def press(self):
+        """Call this method right before synth.press()"""
+        self.env.a = self.smin
+        self.env.b = self.press_env
+        self.env.c = 1.0
+        self.press_lfo.retrigger()
+
+    def release(self):
+        """Call this method right before synth.release()"""
+        self.env.b = self.env.value  # curr val is new start value
+        self.env.c = self.release_curve
+        self.release_lfo.retrigger()
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`pattern_bank`
+================================================================================
+
+`PatternBank` holds preloaded sequencer patterns and a song chain.
+
+Part of synth_tools.
+
+"""
+
+
+class PatternBank:
+    """
+    Preloaded patterns for a sequencer, plus an optional song chain of
+    pattern indices to play in order. The sequencer asks `next_pattern()`
+    at the end of each pass through its steps, and switches by pointing
+    at the stored pattern, so nothing is built or copied while playing.
+
+    A pattern queued with `queue()` plays next, ahead of the chain.
+    """
+
+    def __init__(self):
+        self.patterns = []
+        self.chain = []  # pattern indices to play in order, the "song"
+        self.chain_pos = -1  # where in the chain we are
+        self.loop = True  # go back to the start of the chain at its end
+        self.queued = None  # pattern index to play next, if any
+        self.current = None  # pattern index playing
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __getitem__(self, index):
+        return self.patterns[index]
+
+    def add(self, pattern):
+        """Add an already converted `pattern`, returning its index"""
+        self.patterns.append(pattern)
+        return len(self.patterns) - 1
+
+    def queue(self, index):
+        """Play pattern `index` from the next pattern boundary"""
+        if not 0 <= index < len(self.patterns):
+            raise IndexError("no pattern %d" % index)
+        self.queued = index
+
+    def set_chain(self, chain, loop=True):
+        """Play the pattern indices in `chain` in order, from its start"""
+        for index in chain:
+            if not 0 <= index < len(self.patterns):
+                raise IndexError("no pattern %d" % index)
+        self.chain = list(chain)
+        self.chain_pos = -1
+        self.loop = loop
+
+    def next_pattern(self):
+        """Return the index of the pattern to switch to at this pattern
+        boundary, or None to keep playing the current one"""
+        if self.queued is not None:
+            index = self.queued
+            self.queued = None
+        elif self.chain:
+            pos = self.chain_pos + 1
+            if pos >= len(self.chain):
+                if not self.loop:
+                    return None
+                pos = 0
+            self.chain_pos = pos
+            index = self.chain[pos]
+        else:
+            return None
+        self.current = index
+        return index
+
+    def rewind(self):
+        """Go back to the start of the chain"""
+        self.chain_pos = -1
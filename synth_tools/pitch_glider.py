@@ -14,18 +14,21 @@
 # 10 Feb 2025 - @todbot / Tod Kurt
 
 import synthio
-import ulab.numpy as np
+from synth_tools.curves import LINEAR, curve_table
 
 
 class Glider:
-    """Attach a Glider to note.bend to implement portamento"""
+    """
+    Attach a Glider to note.bend to implement portamento.
+    `curve` shapes the glide, any shape `curve_table` takes.
+    """
 
-    def __init__(self, glide_time, midi_note):
+    def __init__(self, glide_time, midi_note, curve=LINEAR, curve_size=32):
         glide_time = glide_time or 0.001
         self.pos = synthio.LFO(
             once=True,
             rate=1 / glide_time,
-            waveform=np.array((0, 32767), dtype=np.int16),
+            waveform=curve_table(curve, curve_size),
         )
         self.lerp = synthio.Math(synthio.MathOperation.CONSTRAINED_LERP, 0, 0, self.pos)
         self.midi_note = midi_note
@@ -39,6 +42,12 @@ class Glider:
         #      "old", self.midi_note, "new:", new_midi_note, self.lerp.a, self.lerp.b)
         self.midi_note = new_midi_note
 
+    def set_note(self, midi_note):
+        """Move straight to `midi_note`, without gliding"""
+        self.lerp.a = 0
+        self.lerp.b = 0
+        self.midi_note = midi_note
+
     def bend_amount(self, old_midi_note, new_midi_note):
         """Calculate how much note.bend has to happen between two notes"""
         return (new_midi_note - old_midi_note) * (1 / 12)
@@ -53,3 +62,131 @@ class Glider:
         """Set glide time in seconds, sets the rate of underlying LFO"""
         glide_time = glide_time or 0.001  # ensure non-zero for division
         self.pos.rate = 1 / glide_time
+
+
+class GlideManager:
+    """
+    Fixed pool of `Glider`, one per voice, for polyphonic portamento.
+    `press()` picks a voice for each new note and sets up its glide;
+    attach ``gliders[voice].lerp`` to the voice's note.bend once, at
+    startup, and it keeps working as voices are reused.
+
+    Voices are matched to notes by ``match="nearest"`` (the voice whose
+    last pitch is nearest the new note, so voices glide the least) or
+    ``match="last"`` (the most recently played voice, last-note priority).
+    Free voices are used first; when all are held, one is taken over.
+
+    With ``legato=True``, a note only glides when it takes over a held
+    voice, and press() then says not to retrigger its envelope; notes on
+    free voices start at their pitch. Otherwise every note glides from
+    the voice's last pitch and is retriggered.
+
+    With ``glide_rate`` set (semitones per second), glide time scales
+    with the interval, looked up from a precomputed table.
+
+    :param int voices: how many voices
+    :param float glide_time: glide time in seconds, if not constant-rate
+    :param int midi_note: starting pitch of every voice
+    :param str match: "nearest" or "last"
+    :param bool legato: only glide between overlapping notes
+    :param float glide_rate: semitones per second for constant-rate glides
+    :param curve: curve shape of the glides, see `Glider`
+    """
+
+    def __init__(
+        self,
+        voices,
+        glide_time=0.1,
+        midi_note=60,
+        match="nearest",
+        legato=False,
+        glide_rate=0,
+        curve=LINEAR,
+    ):
+        if match not in ("nearest", "last"):
+            raise ValueError("match must be 'nearest' or 'last'")
+        self.match = match
+        self.legato = legato
+        self._glide_time = glide_time
+        self.gliders = [Glider(glide_time, midi_note, curve) for _ in range(voices)]
+        self.held = [None] * voices  # note each voice is holding, or None
+        self.when = [0] * voices  # when each voice was last pressed
+        self.clock = 0
+        self.glide_times = [glide_time] * 128  # glide time for each interval
+        self._glide_rate = 0
+        self.glide_rate = glide_rate
+
+    @property
+    def glide_time(self):
+        """Seconds each glide takes, when `glide_rate` is 0"""
+        return self._glide_time
+
+    @glide_time.setter
+    def glide_time(self, glide_time):
+        """Set the fixed glide time, refilling the glide times if in use"""
+        self._glide_time = glide_time
+        if not self._glide_rate:
+            for interval in range(128):
+                self.glide_times[interval] = glide_time
+
+    @property
+    def glide_rate(self):
+        """Semitones per second for constant-rate glides, 0 for fixed time"""
+        return self._glide_rate
+
+    @glide_rate.setter
+    def glide_rate(self, glide_rate):
+        """Set the glide rate and precompute the glide time of every interval"""
+        self._glide_rate = glide_rate
+        for interval in range(128):
+            if glide_rate:
+                self.glide_times[interval] = max(0.001, interval / glide_rate)
+            else:
+                self.glide_times[interval] = self._glide_time
+
+    def _pick(self, midi_note, held):
+        """Best voice that is (or is not) `held` for `midi_note`, or -1"""
+        best = -1
+        best_score = 0
+        nearest = self.match == "nearest"
+        for v, glider in enumerate(self.gliders):
+            if (self.held[v] is not None) != held:
+                continue
+            if nearest:
+                score = -abs(glider.midi_note - midi_note)
+            else:
+                score = self.when[v]
+            if best < 0 or score > best_score:
+                best = v
+                best_score = score
+        return best
+
+    def press(self, midi_note):
+        """
+        Pick a voice for `midi_note` and start its glide.
+        Returns (voice, retrigger): the voice index, and whether its
+        envelope should be retriggered (False for a legato glide).
+        """
+        voice = self._pick(midi_note, False)
+        took_over = voice < 0
+        if took_over:
+            voice = self._pick(midi_note, True)
+        glider = self.gliders[voice]
+        if self.legato and not took_over:
+            glider.set_note(midi_note)
+        else:
+            interval = min(abs(midi_note - glider.midi_note), 127)
+            glider.glide_time = self.glide_times[interval]
+            glider.update(midi_note)
+        self.held[voice] = midi_note
+        self.clock += 1
+        self.when[voice] = self.clock
+        return voice, not (self.legato and took_over)
+
+    def release(self, midi_note):
+        """Free the voice holding `midi_note`, returning it, or None"""
+        for v in range(len(self.held)):
+            if self.held[v] == midi_note:
+                self.held[v] = None
+                return v
+        return None
@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`sequencer_bench`
+================================================================================
+
+`SequencerBench` measures sequencer timing against a simulated clock.
+
+Part of synth_tools. Meant to run on a host, under plain CPython.
+
+"""
+
+import random
+import time
+
+
+class SimClock:
+    """
+    Simulated millisecond clock to use in place of ``ticks_ms``.
+    Calling it returns the current time, whole milliseconds like ticks_ms.
+    """
+
+    def __init__(self, millis=0):
+        self.millis = millis
+
+    def __call__(self):
+        return int(self.millis)
+
+    def advance(self, millis):
+        """Move the clock forward by `millis`"""
+        self.millis += millis
+
+
+class SequencerBench:
+    """
+    Headless timing harness for `StepSequencer`, `TrigSequencer` and
+    `Arpeggiator`. It points the sequencer's scheduler at a `SimClock`,
+    wraps its note-on callback to record when each one happens, and calls
+    `update()` at simulated poll intervals, with optional random poll
+    jitter and periodic pauses standing in for garbage collection.
+
+    Each note-on is compared to the nearest step of the ideal grid from
+    when the sequencer started, so errors over half a step alias; swing
+    and nudges also count as error. The sequencer must play a note on
+    every step for `report()` drift to be meaningful.
+
+    :param seq: the sequencer to test, with callbacks already set
+    :param float poll_millis: time between `update()` calls
+    :param float jitter_millis: random +/- variation of each poll interval
+    :param float gc_every_millis: how often to pause, 0 for never
+    :param float gc_pause_millis: how long each pause lasts
+    :param int seed: random seed, for repeatable runs
+    """
+
+    def __init__(
+        self,
+        seq,
+        poll_millis=1,
+        jitter_millis=0,
+        gc_every_millis=0,
+        gc_pause_millis=0,
+        seed=0,
+    ):
+        self.seq = seq
+        self.poll_millis = poll_millis
+        self.jitter_millis = jitter_millis
+        self.gc_every_millis = gc_every_millis
+        self.gc_pause_millis = gc_pause_millis
+        self.random = random.Random(seed)
+        self.clock = SimClock()
+        seq.scheduler.clock = self.clock
+        self.on_times = []  # simulated time of each note-on
+        self.update_secs = 0.0  # host time spent in update()
+        self.polls = 0
+        self.start_millis = 0
+        on_func = seq.on_func
+
+        def record_on(*args):
+            self.on_times.append(self.clock.millis)
+            if on_func:
+                on_func(*args)
+
+        seq.on_func = record_on
+        if seq.off_func is None:
+            seq.off_func = lambda *args: None
+
+    def run(self, millis):
+        """Start the sequencer and run it for `millis` of simulated time"""
+        clock = self.clock
+        seq = self.seq
+        rand = self.random
+        self.start_millis = clock.millis
+        end = clock.millis + millis
+        next_gc = clock.millis + self.gc_every_millis
+        seq.start()
+        while clock.millis < end:
+            t = time.perf_counter()
+            seq.update()
+            self.update_secs += time.perf_counter() - t
+            self.polls += 1
+            step = self.poll_millis
+            if self.jitter_millis:
+                step += rand.uniform(-self.jitter_millis, self.jitter_millis)
+            clock.advance(max(step, 0))
+            if self.gc_every_millis and clock.millis >= next_gc:
+                clock.advance(self.gc_pause_millis)
+                next_gc += self.gc_every_millis
+        seq.stop()
+
+    def run_bars(self, bars, beats_per_bar=4):
+        """Run for `bars` bars at the sequencer's current tempo"""
+        self.run(bars * beats_per_bar * 60_000 / self.seq.bpm)
+
+    def errors(self):
+        """Return the (step number, error in ms) of every note-on"""
+        step_millis = self.seq.step_millis
+        start = self.start_millis
+        out = []
+        for t in self.on_times:
+            n = round((t - start) / step_millis)
+            out.append((n, t - (start + n * step_millis)))
+        return out
+
+    def report(self):
+        """
+        Return a dict of timing statistics: note-on count, mean, mean
+        absolute and max absolute error, 50/95/99th percentile absolute
+        error (all ms), drift in ms per 1000 steps (slope of error over
+        steps), and mean host microseconds per `update()`.
+        """
+        errs = self.errors()
+        count = len(errs)
+        report = {"count": count, "polls": self.polls}
+        report["update_us"] = (
+            self.update_secs * 1_000_000 / self.polls if self.polls else 0
+        )
+        if not count:
+            return report
+        abs_errs = sorted(abs(e) for _, e in errs)
+        report["mean"] = sum(e for _, e in errs) / count
+        report["mean_abs"] = sum(abs_errs) / count
+        report["max"] = abs_errs[-1]
+        for pct in (50, 95, 99):
+            report["p%d" % pct] = abs_errs[min(count - 1, count * pct // 100)]
+        # least-squares slope of error against step number
+        mean_n = sum(n for n, _ in errs) / count
+        var_n = sum((n - mean_n) ** 2 for n, _ in errs)
+        cov = sum((n - mean_n) * e for n, e in errs)
+        report["drift"] = cov / var_n * 1000 if var_n else 0
+        return report
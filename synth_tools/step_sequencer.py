@@ -11,45 +11,122 @@ Part of synth_tools.
 
 """
 
-import time
+from array import array
+from synth_tools.event_queue import EventQueue
+from synth_tools.pattern_bank import PatternBank
+from synth_tools.step_timing import StepTiming
+from synth_tools.tick_scheduler import TickScheduler
 
-try:
-    from supervisor import ticks_ms
-except ImportError:
 
-    def ticks_ms():
-        """stand-in for supervisor.ticks_ms"""
-        return time.monotonic_ns() // 1_000_000
+class StepPattern:
+    """
+    The steps of a `StepSequencer` pattern, stored as parallel array
+    columns `notes`, `vels`, `gates` and `ons` instead of one list per step.
+    ``pattern[i]`` gets or sets step i as a (notenum, vel, gate, on) tuple,
+    for editing; the sequencer reads the columns directly.
+
+    :param int step_count: how many steps
+    """
+
+    __slots__ = ("notes", "vels", "gates", "ons")
+
+    def __init__(self, step_count, note=0, vel=127, gate=0.5, on=True):
+        self.notes = array("B", [note] * step_count)
+        self.vels = array("B", [vel] * step_count)
+        self.gates = array("f", [gate] * step_count)
+        self.ons = array("B", [on] * step_count)
+
+    def __len__(self):
+        return len(self.notes)
+
+    def __getitem__(self, i):
+        return (self.notes[i], self.vels[i], self.gates[i], bool(self.ons[i]))
+
+    def __setitem__(self, i, step):
+        self.notes[i], self.vels[i], self.gates[i], self.ons[i] = step
+
+    def __repr__(self):
+        return "StepPattern(notes=%s, vels=%s, gates=%s, ons=%s)" % (
+            list(self.notes),
+            list(self.vels),
+            [round(g, 3) for g in self.gates],
+            [bool(on) for on in self.ons],
+        )
 
 
-class StepSequencer:
+class StepSequencer(StepTiming):
     """
     StepSequencer contains a list of meloci events in list of steps.
 
+    The steps are a `StepPattern` in `steps`: set a step's note with
+    ``seq.steps.notes[i] = 60``, a whole step with
+    ``seq.steps[i] = (notenum, vel, gate, on)``, or a whole column with
+    `set_notes()`, `set_vels()` and `set_gates()`.
+
     :param int step_count: how many for all the triggers
     :param int steps_per_beat: number of steps in a beat (1=quarter note, 2=8th note, 4=16th note)
     :param function on_func: function to call on note-on
     :param function off_func: function to call on note-off
+    :param int lookahead_millis: if non-zero, render this far ahead into `queue`
+    :param int queue_size: how many events `queue` can hold in lookahead mode
+
+    In lookahead mode, each `update()` renders the note-on and note-off
+    events of every step due in the next ``lookahead_millis`` into an
+    `EventQueue`, then dispatches the ones that are due. Between updates,
+    ``queue.ticks_until_next()`` says how long the host can spend on
+    other work before the next event.
+
+    Patterns added with `add_pattern()` are kept in `bank`, a
+    `PatternBank`. Queue one with ``bank.queue(index)`` or set a song with
+    ``bank.set_chain(indices)``, and `steps` switches to it when the
+    sequence wraps back to its first step.
+
+    Swing, per-step nudges and ratchets come from `StepTiming`.
     """
 
-    def __init__(self, step_count, steps_per_beat, on_func=None, off_func=None):
+    def __init__(
+        self,
+        step_count,
+        steps_per_beat,
+        on_func=None,
+        off_func=None,
+        lookahead_millis=0,
+        queue_size=32,
+    ):
         self.steps_per_beat = (
             steps_per_beat  # 1 = 1/4 note, 2 = 8th note, 4 = 16th note
         )
         self.step_count = step_count  # how big the sequence is
         self.i = 0  # where in the step sequence we currently are
 
-        # our sequence, list of step "objects": ie. list (notenum, vel, gate, on)
-        self.steps = [[0, 127, 0.5, True] for i in range(step_count)]
+        # our sequence, columns of (notenum, vel, gate, on) for each step
+        self.steps = StepPattern(step_count)
+        self.bank = PatternBank()  # preloaded patterns and song chain
 
         self.on_func = on_func  # callback to invoke when 'note on' should be sent
         self.off_func = off_func  # callback to invoke when 'note off' should be sent
         self.gate_off_millis = 0  # when in the future our note off should occur
         self.held_note = None  # the current note playing
+        self.held_vel = 0  # and the rest of its step
+        self.held_gate = 0
+        self.held_on = False
         self.transpose = 0
         self.playing = False  # is sequence running or not (but use .start()/.stop())
-        self.next_millis = 0
-        self.error_millis = 0
+        self.scheduler = TickScheduler()  # when each step happens
+        self.lookahead_millis = lookahead_millis
+        self.queue = None
+        if lookahead_millis:
+            self.queue = EventQueue(queue_size, self.scheduler.now)
+        self._init_timing(step_count, queue_size)
+
+    @property
+    def step_millis(self):
+        """Time between steps in milliseconds"""
+        return self.scheduler.step_millis
+
+    @step_millis.setter
+    def step_millis(self, step_millis):
+        self.scheduler.step_millis = step_millis
 
     @property
     def bpm(self):
@@ -64,19 +141,49 @@ class StepSequencer:
 
     def set_gates(self, gate):
         """Set all gates to a specified percentage 0-1"""
+        gates = self.steps.gates
+        for i in range(self.step_count):
+            gates[i] = gate
+
+    def set_vels(self, vel):
+        """Set all velocities to `vel`, 0-127"""
+        vels = self.steps.vels
         for i in range(self.step_count):
-            self.steps[i][2] = gate
+            vels[i] = vel
+
+    def set_notes(self, notes):
+        """Set the note of each step from the list `notes`"""
+        steps_notes = self.steps.notes
+        for i in range(min(len(notes), self.step_count)):
+            steps_notes[i] = notes[i]
+
+    def add_pattern(self, steps):
+        """Add a pattern, a list of (notenum, vel, gate, on) for each step,
+        to `bank`. Returns its index."""
+        pattern = StepPattern(self.step_count, on=False)
+        for i, step in enumerate(steps[: self.step_count]):
+            pattern[i] = step
+        return self.bank.add(pattern)
+
+    def next_bar(self):
+        """Switch `steps` to the bank's next pattern, if any is due"""
+        index = self.bank.next_pattern()
+        if index is not None:
+            self.steps = self.bank[index]
 
     def start(self):
         """Start sequencer going"""
-        self.next_millis = ticks_ms()
+        if self.i == 0:
+            self.next_bar()
+        self.scheduler.start()
         self.playing = True
-        self.error_millis = 0
 
     def stop(self):
         """Stop sequencer, turning off any currently-sounding note"""
-        if self.held_note:
-            self.off_func(*self.held_note)
+        if self.queue is not None:
+            self.queue.clear()
+        if self.held_note is not None:
+            self.note_off_held()
         self.playing = False
         self.i = 0
 
@@ -85,31 +192,107 @@ class StepSequencer:
         if not self.playing:
             return
 
-        now = ticks_ms()
-        delta_millis = now - self.next_millis
+        now = self.scheduler.clock()
+
+        if self.queue is not None:
+            self.render(now)
+            self.queue.dispatch(now)
+            return
 
         # trigger note-off after gate time
-        if now - self.gate_off_millis >= 0 and self.held_note:
-            self.off_func(*self.held_note)
-            self.held_note = None
+        if now - self.gate_off_millis >= 0 and self.held_note is not None:
+            self.note_off_held()
 
-        if delta_millis >= 0:  # if zero or great, time for next step
-            # print("                      delta_millis:", delta_millis, self.error_millis)
-            self.error_millis += delta_millis
-            (note, vel, gate, on) = self.steps[self.i]  # get new note to play
-            note += self.transpose  # adjust for transpose
-            self.held_note = (note, vel, gate, on)  # save it for when we note_off it
+        if self.scheduler.poll(now):  # time for next step
+            step_time = self.scheduler.last_millis  # when the step was due
+            # read the step's columns, saving them for when we note_off it
+            steps = self.steps
+            i = self.i
+            note = self.held_note = steps.notes[i] + self.transpose
+            vel = self.held_vel = steps.vels[i]
+            gate = self.held_gate = steps.gates[i]
+            on = self.held_on = bool(steps.ons[i])
+            self.next_step()
 
             # trigger new note
-            self.on_func(*self.held_note)  # held_note = (note,vel,gate,on)
-
-            # prep for next step in sequence
-            self.i = (self.i + 1) % self.step_count
-
-            # set up when next note on is, with some error correction
-            self.next_millis = now + self.step_millis
-            if self.error_millis > 1:
-                self.next_millis -= self.error_millis
-                self.error_millis = 0
-            # next note off is some percentage smaller
-            self.gate_off_millis = now + self.step_millis * self.held_note[2]
+            self.on_func(note, vel, gate, on)
+
+            # next note off is some percentage of the step after it was due
+            self.gate_off_millis = step_time + self.step_millis * gate
+
+    def note_off_held(self):
+        """Send note-off for the held note"""
+        note = self.held_note
+        self.held_note = None
+        self.off_func(note, self.held_vel, self.held_gate, self.held_on)
+
+    def next_step(self):
+        """Move to the next step, switching patterns at the end of the sequence"""
+        self.i = (self.i + 1) % self.step_count
+        if self.i == 0:
+            self.next_bar()
+
+    def next_note(self):
+        """Return the (note,vel,gate,on) of the current step and move to the next"""
+        # read the step's columns, as update() does, into the one tuple returned
+        steps = self.steps
+        i = self.i
+        held = (
+            steps.notes[i] + self.transpose,
+            steps.vels[i],
+            steps.gates[i],
+            bool(steps.ons[i]),
+        )
+        # prep for next step in sequence
+        self.next_step()
+        return held
+
+    def step_events(self, capacity=None):
+        """How many events `render_step()` will queue for the next step,
+        into a queue of `capacity`"""
+        return 2 * self.ratchet_count(self.i, 2, capacity)
+
+    def render(self, now):
+        """Queue the events of every step due within `lookahead_millis`"""
+        queue = self.queue
+        ahead = self.lookahead_millis + self.timing_ahead
+        while queue.capacity - len(queue) >= self.step_events(
+            queue.capacity
+        ) and self.scheduler.poll(now, ahead):
+            self.render_step(self.scheduler.last_millis, queue)
+
+    def render_step(self, step_time, queue):
+        """Queue the note-on and note-off of the next step, due at `step_time`"""
+        i = self.i
+        held = self.next_note()
+        if not self.timing:
+            queue.push(step_time, self._note_on, held)
+            queue.push(step_time + self.step_millis * held[2], self._note_off, held)
+            return
+        when = step_time + self.step_offset(i)
+        count = self.ratchet_count(i, 2, queue.capacity)
+        sub_millis = self.step_millis / count
+        for _ in range(count):
+            queue.push(when, self._note_on, held)
+            queue.push(when + sub_millis * held[2], self._note_off, held)
+            when += sub_millis
+
+    def _use_timing(self):
+        polled = self.queue is None
+        super()._use_timing()
+        if polled and self.held_note is not None:
+            # the polled path no longer runs to end the held note, so queue it
+            held = (self.held_note, self.held_vel, self.held_gate, self.held_on)
+            self.queue.push(self.gate_off_millis, self._note_off, held)
+
+    def _note_on(self, note, vel, gate, on):
+        self.held_note = note
+        self.held_vel = vel
+        self.held_gate = gate
+        self.held_on = on
+        self.on_func(note, vel, gate, on)
+
+    def _note_off(self, note, vel, gate, on):
+        if self.held_note == note:
+            self.held_note = None
+        self.off_func(note, vel, gate, on)
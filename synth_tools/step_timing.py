@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`step_timing`
+================================================================================
+
+`StepTiming` adds swing, ratchets and per-step microtiming to sequencers.
+
+Part of synth_tools.
+
+"""
+
+from array import array
+from synth_tools.event_queue import EventQueue
+
+
+class StepTiming:
+    """
+    Swing, per-step nudges and ratchets for `StepSequencer` and
+    `TrigSequencer`, which inherit it. Offsets are worked out as each step
+    is rendered into the sequencer's `EventQueue`, so every sub-event has
+    its exact due time in advance. Setting any of them switches the
+    sequencer to queued mode if it is not already; while all are unused,
+    steps play on the plain grid with no extra work per poll.
+
+    * `swing`: percent, 50 is straight, 66 is triplet feel, up to 75.
+      Delays every odd step by ``(swing / 50 - 1)`` of a step.
+    * `nudges`: per-step offset in percent of a step, -50 to 50
+    * `ratchets`: per-step count of evenly spaced retriggers, 1 is normal.
+      A step's ratchets are cut down to what its queue can hold.
+
+    Change them with `swing`, `set_nudge()` and `set_ratchet()`.
+    """
+
+    def _init_timing(self, step_count, queue_size):
+        self._swing = 50
+        self.nudges = array("b", [0] * step_count)
+        self.ratchets = array("B", [1] * step_count)
+        self.timing = False  # any swing, nudges or ratchets in use
+        self.queue_size = queue_size
+
+    def _use_timing(self):
+        self.timing = True
+        if self.queue is None:
+            self.queue = EventQueue(self.queue_size, self.scheduler.now)
+
+    @property
+    def swing(self):
+        """Swing percent, 50 for none"""
+        return self._swing
+
+    @swing.setter
+    def swing(self, swing):
+        self._swing = min(max(swing, 50), 75)
+        if self._swing != 50:
+            self._use_timing()
+
+    def set_nudge(self, step, percent):
+        """Move step `step` earlier (negative) or later by `percent` of a step"""
+        self.nudges[step] = min(max(int(percent), -50), 50)
+        if percent:
+            self._use_timing()
+
+    def set_ratchet(self, step, count):
+        """Play step `step` `count` times, evenly spread over the step"""
+        self.ratchets[step] = min(max(int(count), 1), 255)
+        if count > 1:
+            self._use_timing()
+
+    def ratchet_count(self, step, hit_events, capacity=None):
+        """How many times step `step` plays: its ratchet count, cut down if
+        need be so its `hit_events` events per hit all fit in `capacity`"""
+        count = self.ratchets[step] if self.timing else 1
+        if capacity is not None and hit_events * count > capacity:
+            count = max(capacity // hit_events, 1)
+        return count
+
+    def step_offset(self, step):
+        """How far step `step` plays from its grid time, in milliseconds"""
+        offset = self.nudges[step] / 100
+        if step % 2:
+            offset += self._swing / 50 - 1
+        return offset * self.step_millis
+
+    @property
+    def timing_ahead(self):
+        """How much further ahead to render, for steps nudged early"""
+        return self.step_millis / 2 if self.timing else 0
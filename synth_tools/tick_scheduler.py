@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 Tod Kurt
+# SPDX-License-Identifier: MIT
+"""
+`tick_scheduler`
+================================================================================
+
+`TickScheduler` is the step clock shared by the sequencers.
+
+Part of synth_tools.
+
+"""
+
+import time
+
+try:
+    from supervisor import ticks_ms
+except ImportError:
+
+    def ticks_ms():
+        """stand-in for supervisor.ticks_ms"""
+        return time.monotonic_ns() // 1_000_000
+
+
+class TickScheduler:
+    """
+    Drift-free step clock. Step n is due at ``origin + n * step_millis``,
+    computed in fractional milliseconds from a fixed origin, so rounding
+    and late polls never accumulate into tempo drift.
+
+    If polled more than ``max_late`` steps late, the missed steps are
+    skipped and the clock restarts from then, instead of rushing to
+    catch up. Once `lock()` has tied it to an external clock, skipping
+    keeps to that grid instead, playing the latest missed step.
+
+    The current time comes from `clock`, ``ticks_ms`` unless another
+    function returning milliseconds is given, like a simulated clock.
+    Sequencers read the time through their scheduler's `clock` too.
+
+    :param float step_millis: time between steps in milliseconds
+    :param int max_late: how many steps late before skipping ahead
+    :param function clock: function returning the current time in ms
+    """
+
+    def __init__(self, step_millis=125, max_late=2, clock=None):
+        self.clock = clock or ticks_ms
+        self._step_millis = step_millis
+        self.max_late = max_late
+        self.origin = 0  # time of step 0
+        self.step = 0  # which step is due next
+        self.last_millis = 0  # when the last step was due
+        self.played = False  # any step played since start()
+        self.locked = False  # following an external grid, from lock()
+
+    @property
+    def step_millis(self):
+        """Time between steps in milliseconds"""
+        return self._step_millis
+
+    @step_millis.setter
+    def step_millis(self, step_millis):
+        """Change the step time, keeping the next step when it was due"""
+        self.origin = self.next_millis
+        self.step = 0
+        self._step_millis = step_millis
+
+    def lock(self, origin, step_millis):
+        """Set when step 0 was and the step time, to follow an external
+        clock. The next step due becomes the one after the last played,
+        counted on the new grid, whatever reset the step count before."""
+        if self.played:
+            self.step = round((self.last_millis - origin) / step_millis) + 1
+        else:  # first step still to play, at the grid step nearest it
+            self.step = max(0, round((self.next_millis - origin) / step_millis))
+        self.origin = origin
+        self._step_millis = step_millis
+        self.locked = True
+
+    def now(self):
+        """The current time from `clock`, for things that follow this
+        scheduler's clock even if it is replaced later"""
+        return self.clock()
+
+    @property
+    def next_millis(self):
+        """When the next step is due, in fractional milliseconds"""
+        return self.origin + self.step * self._step_millis
+
+    def start(self, now=None):
+        """Make the first step due at `now` (default the current time)"""
+        self.origin = self.clock() if now is None else now
+        self.step = 0
+        self.last_millis = self.origin
+        self.played = False
+        self.locked = False
+
+    def ticks_until_next(self, now=None):
+        """Milliseconds until the next step is due, negative if overdue"""
+        if now is None:
+            now = self.clock()
+        return self.next_millis - now
+
+    def poll(self, now=None, ahead=0):
+        """
+        Return True if a step is due, or will be within `ahead` ms, and
+        advance to the following step. `last_millis` is then when the step
+        is due, the time to base gate lengths on.
+        """
+        if now is None:
+            now = self.clock()
+        due = self.next_millis
+        late = now - due
+        if late + ahead < 0:
+            return False
+        if late >= self._step_millis * self.max_late:  # too late, skip ahead
+            if self.locked:  # to the latest missed step, on the grid
+                self.step += int(late // self._step_millis)
+                due = self.next_millis
+            else:
+                self.origin = due = now
+                self.step = 0
+        self.last_millis = due
+        self.step += 1
+        self.played = True
+        return True
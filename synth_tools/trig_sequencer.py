@@ -11,40 +11,98 @@ Part of synth_tools.
 
 """
 
-import time
+from array import array
+from synth_tools.event_queue import EventQueue
+from synth_tools.pattern_bank import PatternBank
+from synth_tools.step_timing import StepTiming
+from synth_tools.tick_scheduler import TickScheduler
 
-try:
-    from supervisor import ticks_ms
-except ImportError:
+# bit positions set in each 4-bit value, to visit only the set bits of a mask
+_NIBBLE_BITS = tuple(tuple(b for b in range(4) if n >> b & 1) for n in range(16))
 
-    def ticks_ms():
-        """stand-in for supervisor.ticks_ms"""
-        return time.monotonic_ns() // 1_000_000
 
+def set_bits(mask):
+    """Yield the index of each set bit in `mask`, lowest first"""
+    base = 0
+    while mask:
+        for b in _NIBBLE_BITS[mask & 15]:
+            yield base + b
+        mask >>= 4
+        base += 4
 
-class TrigSequencer:
+
+def bit_count(mask):
+    """How many bits are set in `mask`"""
+    count = 0
+    while mask:
+        count += len(_NIBBLE_BITS[mask & 15])
+        mask >>= 4
+    return count
+
+
+class TrigSequencer(StepTiming):
     """
     TrigSequencer contains a list of on/off event triggers in list of steps.
 
+    Each step is stored as one bitmask in `steps`, with bit t set if
+    trigger t fires on that step, so playing a step only visits the
+    triggers that fire. Use `set_pattern()`, `set_trig()` and `get_trig()`
+    to edit them, or assign a whole pattern to `trigs`. Reading `trigs`
+    gives a tuple-of-tuples copy, so it cannot be edited in place.
+
+    Patterns added with `add_pattern()` are kept packed in `bank`, a
+    `PatternBank`. Queue one with ``bank.queue(index)`` or set a song with
+    ``bank.set_chain(indices)``, and `steps` switches to it when the
+    sequence wraps back to its first step.
+
+    Swing, per-step nudges and ratchets come from `StepTiming`.
+
     :param int trig_count: how many triggers to keep track of
     :param int step_count: how many for all the triggers
     :param int steps_per_beat: number of steps in a beat (1=quarter note, 2=8th note, 4=16th note)
     :param function on_func: function to call on trigger start
     :param function off_func: function to call on trigger end (unused)
+    :param int lookahead_millis: if non-zero, render this far ahead into `queue`
+    :param int queue_size: how many events `queue` can hold in lookahead mode,
+      at least `trig_count`
     """
 
     def __init__(
-        self, trig_count, step_count, steps_per_beat, on_func=None, off_func=None
+        self,
+        trig_count,
+        step_count,
+        steps_per_beat,
+        on_func=None,
+        off_func=None,
+        lookahead_millis=0,
+        queue_size=32,
     ):
         self.trig_count = trig_count
         self.step_count = step_count
         self.steps_per_beat = steps_per_beat
         self.on_func = on_func
         self.off_func = off_func
-        self.trigs = [[0 for t in range(step_count)] for i in range(trig_count)]
+        self.steps = self._new_steps()  # one bitmask of triggers per step
+        self.bank = PatternBank()  # preloaded patterns and song chain
         self.i = 0  # where in the step sequence we currently are
         self.playing = False
         self.drum_map = [0] * trig_count
+        queue_size = max(queue_size, trig_count)  # room for a step of every trig
+        self.scheduler = TickScheduler()  # when each step happens
+        self.lookahead_millis = lookahead_millis
+        self.queue = None
+        if lookahead_millis:
+            self.queue = EventQueue(queue_size, self.scheduler.now)
+        self._init_timing(step_count, queue_size)
+
+    @property
+    def step_millis(self):
+        """Time between steps in milliseconds"""
+        return self.scheduler.step_millis
+
+    @step_millis.setter
+    def step_millis(self, step_millis):
+        self.scheduler.step_millis = step_millis
 
     @property
     def bpm(self):
@@ -55,14 +113,25 @@ class TrigSequencer:
         """Sets the internal tempo. step_millis is time between steps"""
         self.step_millis = 60_000 / self.steps_per_beat / bpm
 
+    def _new_steps(self):
+        """Empty step bitmasks, as small as the trigger count allows"""
+        if self.trig_count <= 16:
+            return array("H", [0] * self.step_count)
+        if self.trig_count <= 32:
+            return array("L", [0] * self.step_count)
+        return [0] * self.step_count
+
     def start(self):
         """Start sequencer going"""
-        self.next_millis = ticks_ms()
+        if self.i == 0:
+            self.next_bar()
+        self.scheduler.start()
         self.playing = True
 
     def stop(self):
-        """Stop sequencer, turning off any currently-sounding note"""
-        self.off_func(*self.held_note)
+        """Stop sequencer, dropping any queued triggers"""
+        if self.queue is not None:
+            self.queue.clear()
         self.playing = False
         self.i = 0
 
@@ -70,24 +139,110 @@ class TrigSequencer:
         self.drum_map = drum_map
 
     def set_pattern(self, pattern):
-        for i in range(len(pattern)):
-            self.trigs[i] = pattern[i]
+        """Set triggers from a list of per-trigger lists of 0/1 for each step.
+        Only the first ``len(pattern)`` triggers are set, the rest are kept,
+        and steps past the end of a row are set off."""
+        self._pack(pattern, self.steps)
+
+    def _pack(self, pattern, steps):
+        """Pack per-trigger lists of 0/1 into the bitmasks `steps`,
+        keeping the bits of triggers past the end of `pattern`"""
+        keep = ~((1 << len(pattern)) - 1)
+        for i in range(self.step_count):
+            mask = steps[i] & keep
+            for t, row in enumerate(pattern):
+                if i < len(row) and row[i]:
+                    mask |= 1 << t
+            steps[i] = mask
+
+    def add_pattern(self, pattern):
+        """Add a pattern, in the same form as `set_pattern()`, to `bank`.
+        Returns its index."""
+        steps = self._new_steps()
+        self._pack(pattern, steps)
+        return self.bank.add(steps)
+
+    def next_bar(self):
+        """Switch `steps` to the bank's next pattern, if any is due"""
+        index = self.bank.next_pattern()
+        if index is not None:
+            self.steps = self.bank[index]
+
+    def _next_step(self):
+        self.i = (self.i + 1) % self.step_count
+        if self.i == 0:
+            self.next_bar()
+
+    def set_trig(self, trig, step, on=True):
+        """Turn trigger `trig` on or off at step `step`"""
+        if on:
+            self.steps[step] |= 1 << trig
+        else:
+            self.steps[step] &= ~(1 << trig)
+
+    def get_trig(self, trig, step):
+        """Return 1 if trigger `trig` fires on step `step`, else 0"""
+        return self.steps[step] >> trig & 1
+
+    @property
+    def trigs(self):
+        """The pattern as per-trigger tuples of 0/1, a read-only copy"""
+        return tuple(
+            tuple(self.steps[i] >> t & 1 for i in range(self.step_count))
+            for t in range(self.trig_count)
+        )
+
+    @trigs.setter
+    def trigs(self, pattern):
+        """Set the pattern, as `set_pattern()` does"""
+        self.set_pattern(pattern)
 
     def update(self):
         """Update the sequencer. Call as frequently as possible"""
         if not self.playing:
             return
 
-        now = ticks_ms()
-        delta_millis = now - self.next_millis
-
-        if delta_millis >= 0:  # time to play
-            # print("                      delta_millis:", delta_millis)
+        if self.queue is not None:
+            now = self.scheduler.clock()
+            self.render(now)
+            self.queue.dispatch(now)
+            return
 
-            for t in range(self.trig_count):
-                if self.trigs[t][self.i] == 1:
-                    self.on_func(t, self.drum_map[t])
+        if self.scheduler.poll():  # time to play
+            for t in set_bits(self.steps[self.i]):
+                self.on_func(t, self.drum_map[t])
 
             # prep for next step in sequence
-            self.i = (self.i + 1) % self.step_count
-            self.next_millis = now + self.step_millis - delta_millis
+            self._next_step()
+
+    def step_events(self, capacity=None):
+        """How many events `render_step()` will queue for the next step,
+        into a queue of `capacity`"""
+        hit_events = bit_count(self.steps[self.i])
+        return hit_events * self.ratchet_count(self.i, hit_events, capacity)
+
+    def render(self, now):
+        """Queue the triggers of every step due within `lookahead_millis`"""
+        queue = self.queue
+        ahead = self.lookahead_millis + self.timing_ahead
+        while queue.capacity - len(queue) >= self.step_events(
+            queue.capacity
+        ) and self.scheduler.poll(now, ahead):
+            self.render_step(self.scheduler.last_millis, queue)
+
+    def render_step(self, step_time, queue):
+        """Queue the triggers of the next step, due at `step_time`"""
+        i = self.i
+        mask = self.steps[i]
+        self._next_step()
+        if not mask:
+            return
+        count = 1
+        if self.timing:
+            step_time += self.step_offset(i)
+            count = self.ratchet_count(i, bit_count(mask), queue.capacity)
+        sub_millis = self.step_millis / count
+        for _ in range(count):
+            for t in set_bits(mask):
+                queue.push(step_time, self.on_func, (t, self.drum_map[t]))
+            step_time += sub_millis
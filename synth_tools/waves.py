@@ -43,11 +43,20 @@ class Waves:
         elif waveid in ("SIL", "SILENCE"):
             wavef = Waves.silence(size)
         elif waveid in ("NZE", "NOISE"):
-            wavef = Waves.noise(size, volume)
+            wavef = Waves.noise_fast(size, volume)
         else:
             print("unknown wave type", waveid)
         return wavef
 
+    @staticmethod
+    def shared_waveform(waveid, size=256, volume=32767):
+        """
+        Like `make_waveform` but returns the same buffer to every caller
+        asking for the same (waveid, size, volume), from `Waves.cache`.
+        The returned waveform is shared, so do not modify it.
+        """
+        return Waves.cache.get(waveid, size, volume)
+
     @staticmethod
     def sine(size, volume):
         """Sine waveform"""
@@ -103,6 +112,77 @@ class Waves:
             [random.randint(-volume, volume) for i in range(size)], dtype=np.int16
         )
 
+    @staticmethod
+    def noise_fast(size, volume, seed=None):
+        """
+        White noise waveform, vectorized. Each sample is an xorshift-multiply
+        hash of its index, with a scrambled `seed` xored into the hash
+        state, so the whole array is made in a few array operations instead
+        of a Python loop, and nearby seeds give unrelated noise.
+        """
+        if seed is None:
+            seed = random.getrandbits(16)
+        seed = (seed & 0xFFFF) * 0x9E37 & 0xFFFF
+        seed ^= seed >> 7
+        x = np.arange(1, size + 1, dtype=np.uint16) * 40503
+        x = np.bitwise_xor(x, np.full(size, seed, dtype=np.uint16))
+        x = np.bitwise_xor(x, np.right_shift(x, 8)) * 0x88B5
+        x = np.bitwise_xor(x, np.right_shift(x, 7)) * 0xDB2D
+        x = np.bitwise_xor(x, np.right_shift(x, 9))
+        wave = np.frombuffer(x, dtype=np.int16)
+        if volume >= 32767:
+            return wave
+        return np.array(wave * (volume / 32768), dtype=np.int16)
+
+    @staticmethod
+    def max_harmonics(size, freq=None, sample_rate=44100):
+        """
+        How many harmonics a band-limited waveform of `size` samples can
+        hold, and if `freq` is given, how many stay below Nyquist when
+        played at `freq` Hz.
+        """
+        harmonics = size // 2 - 1
+        if freq:
+            harmonics = min(harmonics, int(sample_rate / 2 / freq))
+        return max(harmonics, 1)
+
+    @staticmethod
+    def additive(size, volume, harmonics, amps, cosine=False):
+        """
+        Waveform summed from `harmonics` harmonics, with the amplitude of
+        harmonic k (1-based) being `amps(k)`, normalized to `volume`.
+        Each harmonic is one vectorized sin()/cos() over the whole wave.
+        """
+        phase = np.linspace(0, 2 * np.pi, size, endpoint=False)
+        func = np.cos if cosine else np.sin
+        acc = np.zeros(size, dtype=np.float)
+        for k in range(1, harmonics + 1):
+            amp = amps(k)
+            if amp:
+                acc += func(phase * k) * amp
+        peak = np.max(abs(acc)) or 1
+        return np.array(acc * (volume / peak), dtype=np.int16)
+
+    @staticmethod
+    def saw_bl(size, volume, freq=None, sample_rate=44100, harmonics=None):
+        """Band-limited saw waveform (from max to min, like `saw`)"""
+        harmonics = harmonics or Waves.max_harmonics(size, freq, sample_rate)
+        return Waves.additive(size, volume, harmonics, lambda k: 1 / k)
+
+    @staticmethod
+    def square_bl(size, volume, freq=None, sample_rate=44100, harmonics=None):
+        """Band-limited square waveform, odd harmonics only"""
+        harmonics = harmonics or Waves.max_harmonics(size, freq, sample_rate)
+        return Waves.additive(size, volume, harmonics, lambda k: (k % 2) / k)
+
+    @staticmethod
+    def triangle_bl(size, volume, freq=None, sample_rate=44100, harmonics=None):
+        """Band-limited triangle waveform (from min to max to min, like `triangle`)"""
+        harmonics = harmonics or Waves.max_harmonics(size, freq, sample_rate)
+        return Waves.additive(
+            size, volume, harmonics, lambda k: -(k % 2) / (k * k), cosine=True
+        )
+
     @staticmethod
     def from_list(vals):
         """Waveform from a list of values, useful for LFOs"""
@@ -151,17 +231,184 @@ class Waves:
 
     @staticmethod
     def wav(filepath, size=256, pos=0):
-        """Create a waveform from a WAV file using adafruit_wave"""
-        with adafruit_wave.open(filepath) as w:
-            if w.getsampwidth() != 2 or w.getnchannels() != 1:
-                raise ValueError("unsupported format")
-            # n = w.getnframes() if size==0 else size
-            n = size
-            w.setpos(pos)
-            return np.frombuffer(w.readframes(n), dtype=np.int16)
+        """Create a waveform from a WAV file, as mono int16 (see `WavReader`)"""
+        with WavReader(filepath, size) as reader:
+            return reader.read(size, pos)
 
     @staticmethod
     def wav_info(filepath):
         """return (nframes,nchannels,sampwidth) from a WAV filename"""
-        with adafruit_wave.open(filepath) as w:
-            return (w.getnframes(), w.getnchannels(), w.getsampwidth())
+        with WavReader(filepath, 1) as reader:
+            return reader.info()
+
+
+class WaveformCache:
+    """
+    Memoizing cache of `Waves.make_waveform` results, keyed by
+    (waveid, size, volume). Total memory is capped at ``max_bytes``,
+    evicting the least recently used waveforms when full. Evicted waveforms
+    stay valid for whoever holds them, they are just no longer shared.
+
+    :param int max_bytes: maximum bytes of waveforms to hold
+    """
+
+    def __init__(self, max_bytes=16384):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.waves = {}  # key -> waveform
+        self.used = {}  # key -> when last used
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, waveid, size=256, volume=32767):
+        """Return the shared waveform, making it if not already cached"""
+        key = (waveid.upper(), size, volume)
+        self.clock += 1
+        wave = self.waves.get(key)
+        if wave is not None:
+            self.hits += 1
+            self.used[key] = self.clock
+            return wave
+        self.misses += 1
+        wave = Waves.make_waveform(waveid, size, volume)
+        if wave is None or len(wave) * 2 > self.max_bytes:
+            return wave  # unknown or too big to share
+        nbytes = len(wave) * 2
+        while self.bytes_used + nbytes > self.max_bytes:
+            if not self.evict():
+                break
+        self.waves[key] = wave
+        self.used[key] = self.clock
+        self.bytes_used += nbytes
+        return wave
+
+    def evict(self):
+        """Drop the least recently used waveform.
+        Returns False if the cache was already empty."""
+        oldest = None
+        for key, when in self.used.items():
+            if oldest is None or when < self.used[oldest]:
+                oldest = key
+        if oldest is None:
+            return False
+        self.bytes_used -= len(self.waves.pop(oldest)) * 2
+        del self.used[oldest]
+        self.evictions += 1
+        return True
+
+    def clear(self):
+        """Empty the cache and reset the counters"""
+        self.waves = {}
+        self.used = {}
+        self.bytes_used = 0
+        self.clock = 0
+        self.hits = self.misses = self.evictions = 0
+
+
+class WavReader:
+    """
+    Streaming WAV file reader that keeps the file open and reads frames
+    in chunks into a reusable int16 buffer. 8-bit, 16-bit and 24-bit
+    files are converted to int16, and multi-channel files are mixed down
+    to mono, a chunk at a time, so the whole file is never in memory.
+
+    Returned chunks are views of the reader's buffer and are overwritten
+    by the next read, so copy them (or pass ``out``) to keep them.
+
+    :param str filepath: path to the WAV file
+    :param int chunk_size: size in frames of the reusable buffer
+    """
+
+    def __init__(self, filepath, chunk_size=256):
+        self.w = adafruit_wave.open(filepath)
+        self.nframes = self.w.getnframes()
+        self.nchannels = self.w.getnchannels()
+        self.sampwidth = self.w.getsampwidth()
+        self.sample_rate = self.w.getframerate()
+        if self.sampwidth not in (1, 2, 3):
+            self.w.close()
+            raise ValueError("unsupported format")
+        self.chunk_size = chunk_size
+        self.buf = np.zeros(chunk_size, dtype=np.int16)
+
+    def info(self):
+        """return (nframes,nchannels,sampwidth) of the WAV file"""
+        return (self.nframes, self.nchannels, self.sampwidth)
+
+    def seek(self, pos):
+        """Move to frame `pos` for the next read"""
+        self.w.setpos(pos)
+
+    def tell(self):
+        """Return the frame position of the next read"""
+        return self.w.tell()
+
+    def read(self, size=None, pos=None, out=None):
+        """
+        Read up to `size` frames (default a whole chunk) from frame `pos`
+        (default where the last read ended) as mono int16 into `out`
+        (default the reader's buffer). Returns a view of the frames read,
+        shorter than `size` at the end of the file.
+        """
+        if out is None:
+            out = self.buf
+        size = len(out) if size is None else min(size, len(out))
+        if pos is not None:
+            self.w.setpos(pos)
+        raw = self.w.readframes(size)
+        nch = self.nchannels
+        samps = self._to_int16(raw)
+        n = len(samps) // nch
+        if nch == 1:
+            out[:n] = samps
+        else:  # mix down to mono
+            mix = np.array(samps[::nch], dtype=np.float)
+            for c in range(1, nch):
+                mix += samps[c::nch]
+            out[:n] = mix / nch
+        return out[:n]
+
+    def _to_int16(self, raw):
+        """Convert interleaved raw sample bytes to int16 samples"""
+        if self.sampwidth == 2:
+            return np.frombuffer(raw, dtype=np.int16)
+        u = np.frombuffer(raw, dtype=np.uint8)
+        if self.sampwidth == 1:  # 8-bit WAV is unsigned
+            return np.array((np.array(u, dtype=np.float) - 128) * 256, dtype=np.int16)
+        # 24-bit little-endian, keep the top two bytes
+        x = np.array(u[2::3], dtype=np.uint16) * 256 + u[1::3]
+        return np.frombuffer(x, dtype=np.int16)
+
+    def chunks(self, size=None, start=0, end=None):
+        """
+        Yield successive chunks of `size` frames (default `chunk_size`)
+        from frame `start` to `end` (default the end of the file).
+        Each chunk is the reader's reused buffer.
+        """
+        size = min(size or self.chunk_size, self.chunk_size)
+        end = self.nframes if end is None else min(end, self.nframes)
+        pos = start
+        self.w.setpos(pos)
+        while pos < end:
+            chunk = self.read(min(size, end - pos))
+            if not len(chunk):
+                return
+            pos += len(chunk)
+            yield chunk
+
+    def close(self):
+        """Close the WAV file"""
+        if self.w is not None:
+            self.w.close()
+            self.w = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+Waves.cache = WaveformCache()
@@ -14,15 +14,154 @@ Part of synth_tools.
 
 """
 
+import os
+import struct
 import ulab.numpy as np
 import adafruit_wave
 
+try:
+    import mmap
+except ImportError:
+    mmap = None  # not on CircuitPython
+
 
 def lerp(a, b, t):  # pylint: disable=invalid-name
     """Mix between values a and b, works with numpy arrays too, t ranges 0-1"""
     return (1 - t) * a + t * b
 
 
+def halfband_decimate(wave):
+    """
+    Low-pass single-cycle `wave` with a half-band filter and drop every
+    other sample, returning a wave half as long with no content above
+    its new Nyquist. The filter wraps around, as the wave is one cycle.
+    """
+    x = np.array(wave, dtype=np.float)
+    acc = x * 16  # taps: -1, 0, 9, 16, 9, 0, -1 (/32)
+    acc += (np.roll(x, 1) + np.roll(x, -1)) * 9
+    acc -= np.roll(x, 3) + np.roll(x, -3)
+    return np.array(np.clip(acc[::2] / 32, -32768, 32767), dtype=np.int16)
+
+
+def resample(wave, new_len):
+    """
+    Resample single-cycle `wave` to `new_len` samples, as floats.
+    Halves it with `halfband_decimate` while at least twice as long, so
+    shrinking does not alias, then linearly interpolates, wrapping around.
+    """
+    while len(wave) >= 2 * new_len:
+        wave = halfband_decimate(wave)
+    old_len = len(wave)
+    wave = np.array(wave, dtype=np.float)
+    if old_len == new_len:
+        return wave
+    xp = np.arange(0, old_len + 1, dtype=np.float)
+    fp = np.concatenate((wave, wave[0:1]))  # wrap to the first sample
+    x = np.arange(0, new_len, dtype=np.float) * (old_len / new_len)
+    return np.interp(x, xp, fp)
+
+
+def rising_zero_crossing(wave):
+    """Index of the first sample where `wave` rises through zero, or 0"""
+    pos = np.array(wave >= 0, dtype=np.int16)
+    rising = pos - np.roll(pos, 1)  # 1 where it goes negative to positive
+    idx = int(np.argmax(rising))
+    return idx if rising[idx] == 1 else 0
+
+
+def loop_jump(wave):
+    """How far `wave` jumps going from its last sample back to its first"""
+    return abs(int(wave[0]) - int(wave[-1]))
+
+
+def normalize_wave(wave, mode="peak", level=None):
+    """
+    Scale float `wave` in place so its peak (``mode="peak"``) or RMS
+    (``mode="rms"``) is `level`, which defaults to full scale for peak and
+    -9 dBFS for RMS. Returns `wave`.
+    """
+    if mode == "rms":
+        level = level or 11585
+        amount = np.sqrt(np.mean(wave * wave))
+    else:
+        level = level or 32767
+        amount = np.max(abs(wave))
+    if amount:
+        wave *= level / amount
+    return wave
+
+
+class WaveCache:
+    """
+    Fixed-capacity least-recently-used cache of single-cycle waves,
+    keyed by wave index. All wave storage is allocated up front.
+
+    :param int capacity: how many waves to hold at most
+    :param int wave_len: number of samples in each wave
+    """
+
+    def __init__(self, capacity, wave_len):
+        self.capacity = capacity
+        self.wave_len = wave_len
+        self.buf = np.zeros(capacity * wave_len, dtype=np.int16)
+        self.slots = {}  # wave index -> slot number in buf
+        self.slot_wave = [-1] * capacity  # wave index held by each slot
+        self.slot_used = [0] * capacity  # when each slot was last used
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def cache_bytes(self):
+        """How many bytes the cache storage is using"""
+        return self.capacity * self.wave_len * 2
+
+    def _view(self, slot):
+        samp_pos = slot * self.wave_len
+        return self.buf[samp_pos : samp_pos + self.wave_len]
+
+    def get(self, idx):
+        """Return cached wave `idx` as a view, or None if not cached"""
+        slot = self.slots.get(idx)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.slot_used[slot] = self.clock
+        return self._view(slot)
+
+    def put(self, idx, wave):
+        """Copy `wave` into the cache as wave `idx`, evicting the least
+        recently used wave if full. Returns the cached view."""
+        slot = len(self.slots)
+        if slot >= self.capacity:  # full, find least recently used
+            used = self.slot_used
+            slot = 0
+            for i in range(1, self.capacity):
+                if used[i] < used[slot]:
+                    slot = i
+            del self.slots[self.slot_wave[slot]]
+            self.evictions += 1
+        self.slots[idx] = slot
+        self.slot_wave[slot] = idx
+        self.clock += 1
+        self.slot_used[slot] = self.clock
+        view = self._view(slot)
+        view[:] = wave
+        return view
+
+    def clear(self):
+        """Empty the cache and reset the counters"""
+        self.slots = {}
+        for i in range(self.capacity):
+            self.slot_wave[i] = -1
+            self.slot_used[i] = 0
+        self.clock = 0
+        self.hits = self.misses = self.evictions = 0
+
+
 class Wavetable:
     """
     A 'waveform' for synthio.Note that uses a wavetable with a scannable
@@ -36,20 +175,234 @@ class Wavetable:
 
     In this implementation, you select a wave position (wave_pos) that can be
     fractional, and the fractional part allows for mixing of the waves
+
+    By default the waves are streamed from the WAV file on every change of
+    `wave_pos`. With ``preload=True`` the waves are instead read once into
+    a single contiguous int16 `bank` and the file is closed, so scanning the
+    table does no file I/O. Use `table_bytes` to see what preloading a table
+    would cost before choosing.
+
+    For tables too big to preload, ``cache_size`` keeps that many recently
+    used waves in a `WaveCache`, so small moves of `wave_pos` are served
+    from memory. Its `hits`/`misses`/`evictions` are on `cache`.
+
+    Morphing between waves uses a fixed-point fraction of ``morph_bits``
+    bits (Q15 by default) and mixes into `waveform` in place, without
+    making new arrays. If neither the wave nor the quantized fraction has
+    changed since the last `wave_pos`, nothing is recomputed.
+
+    With ``mip_levels=N``, N progressively low-passed and halved copies of
+    every wave are built at load time into one compact `mip_bank`. Setting
+    `freq` to the note frequency then picks the longest level that does
+    not alias at that pitch, and `waveform` becomes that level's buffer,
+    so re-assign it to the note when `freq` changes `mip_level`.
+
+    Waves can also be processed once at load time, into the preloaded
+    `bank`: resampled from ``source_len`` to ``wave_len`` samples, DC
+    offset removed, rotated so wave 0 starts at a rising zero crossing
+    (``align``, the same rotation for every wave to keep them in phase),
+    and peak or RMS normalized. The largest loop discontinuity found is
+    kept in `loop_jump`.
+
+    :param str filepath: path to a 16-bit mono WAV file of waves, or an
+      already open wave reader, like a `WavetableBundle` entry
+    :param int wave_len: number of samples in each wave
+    :param int source_len: samples per wave in the file, if not `wave_len`
+    :param str normalize: normalize each wave, "peak", "rms" or None
+    :param bool remove_dc: remove each wave's DC offset
+    :param bool align: rotate waves to start at a rising zero crossing
+    :param bool preload: read the waves into memory instead of streaming them
+    :param tuple wave_range: optional (first, end) range of wave indices to use,
+      end is exclusive. Wave position 0 is then the first wave of the range.
+    :param int cache_size: if streaming, how many waves to keep in a LRU cache
+    :param int morph_bits: resolution of the mix between two waves, 1-15
+    :param int mip_levels: how many per-octave mip levels to build, 0 for none
+    :param int synth_rate: sample rate of the synth playing the waves,
+      used to pick the mip level for a `freq`
     """
 
-    def __init__(self, filepath, wave_len=256):
-        self.w = adafruit_wave.open(filepath)
+    def __init__(
+        self,
+        filepath,
+        wave_len=256,
+        preload=False,
+        wave_range=None,
+        cache_size=0,
+        morph_bits=15,
+        mip_levels=0,
+        synth_rate=44100,
+        source_len=None,
+        normalize=None,
+        remove_dc=False,
+        align=False,
+    ):
+        if isinstance(filepath, str):
+            self.w = adafruit_wave.open(filepath)
+        else:
+            self.w = filepath
         self.wave_len = wave_len  # how many samples in each wave
         if self.w.getsampwidth() != 2 or self.w.getnchannels() != 1:
             raise ValueError("unsupported WAV format")
         # empty buffer we'll copy into
         self.waveform = np.zeros(wave_len, dtype=np.int16)
-        self.num_waves = self.w.getnframes() // self.wave_len
-        self.num_samples = self.w.getnframes()
+        # scratch buffer for mixing, ulab has no int32 to hold int16*Q15
+        self._mix = np.zeros(wave_len, dtype=np.float)
+        self.morph_bits = min(max(morph_bits, 1), 15)
+        self._morph_key = None  # (wave index, quantized fraction) last mixed
+        source_len = source_len or wave_len  # samples per wave in the file
+        self.num_waves = self.w.getnframes() // source_len
         self.sample_rate = self.w.getframerate()
+        self.first_wave = 0
+        if wave_range is not None:
+            first, end = wave_range
+            if not 0 <= first < end <= self.num_waves:
+                raise ValueError("wave_range outside of wavetable")
+            self.first_wave = first
+            self.num_waves = end - first
+        self.num_samples = self.num_waves * self.wave_len
+        self.bank = None  # contiguous copy of all waves, if preloaded
+        self.loop_jump = 0  # worst loop discontinuity, if processed
+        if source_len != wave_len or normalize or remove_dc or align:
+            self.load_processed(source_len, normalize, remove_dc, align)
+            self.w.close()
+            self.w = None
+        elif preload:
+            self.w.setpos(self.first_wave * self.wave_len)
+            self.bank = np.frombuffer(
+                self.w.readframes(self.num_samples), dtype=np.int16
+            )
+            self.w.close()
+            self.w = None
+        self.cache = None  # LRU cache of streamed waves, if wanted
+        if cache_size and self.bank is None:
+            # needs room for at least both waves being mixed
+            self.cache = WaveCache(max(2, min(cache_size, self.num_waves)), wave_len)
+        self.synth_rate = synth_rate
+        while mip_levels and (wave_len >> mip_levels) < 8:
+            mip_levels -= 1  # keep the shortest level a usable wave
+        self.mip_levels = mip_levels
+        self.mip_level = 0  # which level `waveform` is playing
+        self.mip_bank = None  # levels 1 and up, each num_waves long
+        self.mip_offsets = [0] * (mip_levels + 1)  # sample offset of each level
+        self.waveforms = [self.waveform]  # mix buffer for each level
+        self._mixes = [self._mix]
+        if mip_levels:
+            self.build_mips()
+        self._freq = 0
         self.wave_pos = 0
 
+    @classmethod
+    def from_bundle(cls, bundle, name, **kwargs):
+        """Make a Wavetable from entry `name` of a `WavetableBundle`,
+        with that entry's wave_len. Other arguments are as for Wavetable."""
+        entry = bundle.open(name)
+        kwargs.setdefault("wave_len", entry.wave_len)
+        return cls(entry, **kwargs)
+
+    def load_processed(self, source_len, normalize=None, remove_dc=False, align=False):
+        """Read every wave from the file, process it, and store it in `bank`.
+        Each wave is processed on its own, so only one raw wave is in
+        memory at a time."""
+        self.bank = np.zeros(self.num_samples, dtype=np.int16)
+        shift = 0
+        for idx in range(self.num_waves):
+            self.w.setpos((self.first_wave + idx) * source_len)
+            raw = np.frombuffer(self.w.readframes(source_len), dtype=np.int16)
+            wave = resample(raw, self.wave_len)
+            if remove_dc:
+                wave -= np.mean(wave)
+            if align:
+                if idx == 0:
+                    shift = rising_zero_crossing(wave)
+                wave = np.roll(wave, -shift)
+            if normalize:
+                normalize_wave(wave, normalize)
+            samp_pos = idx * self.wave_len
+            out = self.bank[samp_pos : samp_pos + self.wave_len]
+            out[:] = np.clip(wave, -32768, 32767)
+            self.loop_jump = max(self.loop_jump, loop_jump(out))
+
+    @property
+    def table_bytes(self):
+        """How many bytes the waves take up (or would if preloaded)"""
+        return self.num_samples * 2
+
+    @property
+    def bank_bytes(self):
+        """How many bytes the preloaded bank is using, 0 if streaming"""
+        return 0 if self.bank is None else self.table_bytes
+
+    @property
+    def mip_bytes(self):
+        """How many bytes the mip levels are using"""
+        return 0 if self.mip_bank is None else len(self.mip_bank) * 2
+
+    def build_mips(self):
+        """Build the mip levels from the full-size waves into `mip_bank`"""
+        offset = 0
+        for level in range(1, self.mip_levels + 1):
+            self.mip_offsets[level] = offset
+            offset += self.num_waves * (self.wave_len >> level)
+        self.mip_bank = np.zeros(offset, dtype=np.int16)
+        for idx in range(self.num_waves):
+            wave = self.wave(idx, 0)
+            for level in range(1, self.mip_levels + 1):
+                wave = halfband_decimate(wave)
+                self.wave(idx, level)[:] = wave
+        for level in range(1, self.mip_levels + 1):
+            wave_len = self.wave_len >> level
+            self.waveforms.append(np.zeros(wave_len, dtype=np.int16))
+            self._mixes.append(self._mix[:wave_len])
+
+    def mip_level_for(self, freq):
+        """The longest mip level that can play at `freq` Hz without aliasing.
+        A wave of N samples holds harmonics up to N/2, so at `freq` it
+        must be no longer than synth_rate/freq samples."""
+        max_len = self.synth_rate / freq
+        level = 0
+        while level < self.mip_levels and (self.wave_len >> level) > max_len:
+            level += 1
+        return level
+
+    @property
+    def freq(self):
+        """The note frequency `waveform` is being played at, 0 if unset"""
+        return self._freq
+
+    @freq.setter
+    def freq(self, freq):
+        """Set the note frequency, selecting the mip level for `waveform`"""
+        self._freq = freq
+        level = self.mip_level_for(freq) if freq else 0
+        if level != self.mip_level:
+            self.mip_level = level
+            self.waveform = self.waveforms[level]
+            self.invalidate()
+            self.wave_pos = self._wave_pos
+
+    def wave(self, idx, level=None):
+        """Return wave number `idx` as an int16 array, at mip `level`
+        (default the current `mip_level`).
+        If preloaded, cached, or a mip level, this is a view and does not copy."""
+        if level is None:
+            level = self.mip_level
+        if level:
+            wave_len = self.wave_len >> level
+            samp_pos = self.mip_offsets[level] + idx * wave_len
+            return self.mip_bank[samp_pos : samp_pos + wave_len]
+        if self.bank is not None:
+            samp_pos = idx * self.wave_len
+            return self.bank[samp_pos : samp_pos + self.wave_len]
+        if self.cache is not None:
+            wave = self.cache.get(idx)
+            if wave is not None:
+                return wave
+        self.w.setpos((self.first_wave + idx) * self.wave_len)
+        wave = np.frombuffer(self.w.readframes(self.wave_len), dtype=np.int16)
+        if self.cache is not None:
+            wave = self.cache.put(idx, wave)
+        return wave
+
     @property
     def wave_pos(self):
         """return current position, 0-wave_len-1"""
@@ -64,12 +417,258 @@ class Wavetable:
         (e.g. wave_pos=15.66 chooses 1/3 of waveform 15 and 2/3 of waveform 16)
         """
         pos = min(max(pos, 0), self.num_waves - 1)  # constrain
-        samp_pos = int(pos) * self.wave_len  # get sample position
-        self.w.setpos(samp_pos)
-        wave_a = np.frombuffer(self.w.readframes(self.wave_len), dtype=np.int16)
-        self.w.setpos(samp_pos + self.wave_len)  # one wave up
-        wave_b = np.frombuffer(self.w.readframes(self.wave_len), dtype=np.int16)
-        pos_frac = pos - int(pos)  # fractional position between wave A & B
-        # mix waveforms A & B
-        self.waveform[:] = lerp(wave_a, wave_b, pos_frac)
+        idx = int(pos)
+        # fractional position between wave A & B, as fixed-point
+        frac_q = int((pos - idx) * (1 << self.morph_bits))
         self._wave_pos = pos
+        if idx >= self.num_waves - 1:  # last wave has no next wave to mix
+            frac_q = 0
+        if self._morph_key == (idx, frac_q):
+            return  # waveform already holds this mix
+        self._morph_key = (idx, frac_q)
+        self.morph(idx, frac_q)
+
+    def morph(self, idx, frac_q):
+        """Mix wave `idx` with wave `idx+1` into `waveform`, in place.
+        `frac_q` is the amount of the second wave, 0 to 2**morph_bits."""
+        wave_a = self.wave(idx)
+        if frac_q == 0:
+            self.waveform[:] = wave_a
+            return
+        wave_b = self.wave(idx + 1)
+        mix = self._mixes[self.mip_level]
+        mix[:] = wave_b  # mix = a + (b - a) * frac
+        mix -= wave_a
+        mix *= frac_q / (1 << self.morph_bits)
+        mix += wave_a
+        self.waveform[:] = mix
+
+    def invalidate(self):
+        """Force the next `wave_pos` to recompute the waveform"""
+        self._morph_key = None
+
+    def close(self):
+        """Close the underlying WAV file, if still open"""
+        if self.w is not None:
+            self.w.close()
+            self.w = None
+
+
+class WavetableScanner:
+    """
+    Drive the `wave_pos` of one or more `Wavetable` from value sources,
+    like a `synthio.LFO` added to `synth.blocks`. Any object with a
+    ``.value`` can be a source. The source value is used as the wave
+    position, so set e.g. ``lfo.scale = wavetable.num_waves``.
+
+    Positions are quantized to ``1/resolution`` of a wave, and a wavetable
+    is only re-mixed when its quantized position changes. Call `update()`
+    regularly to service every bound wavetable at once.
+
+    :param int resolution: how many positions per wave to distinguish
+    """
+
+    def __init__(self, resolution=32):
+        self.resolution = resolution
+        self.wavetables = []
+        self.sources = []
+        self.last_pos = []  # last quantized position of each wavetable
+
+    def add(self, wavetable, source):
+        """Bind `wavetable` to be driven by `source.value`"""
+        self.wavetables.append(wavetable)
+        self.sources.append(source)
+        self.last_pos.append(-1)
+
+    def remove(self, wavetable):
+        """Stop driving `wavetable`"""
+        i = self.wavetables.index(wavetable)
+        self.wavetables.pop(i)
+        self.sources.pop(i)
+        self.last_pos.pop(i)
+
+    def update(self):
+        """Update all bound wavetables whose position has changed.
+        Returns how many wavetables were re-mixed."""
+        res = self.resolution
+        last_pos = self.last_pos
+        sources = self.sources
+        count = 0
+        for i, wavetable in enumerate(self.wavetables):
+            pos = int(sources[i].value * res)
+            if pos != last_pos[i]:
+                last_pos[i] = pos
+                wavetable.wave_pos = pos / res
+                count += 1
+        return count
+
+
+class WavetableBundle:
+    """
+    Many wavetables packed into one file, with an index up front so a
+    table is found without parsing any WAV headers and read with a single
+    seek. The format, all little-endian, is:
+
+    * header: ``b"SYWT"``, version (u16), entry count (u16)
+    * per entry: name (16 bytes, NUL padded), num_waves (u16),
+      wave_len (u16), sample_rate (u32), byte offset of its samples (u32)
+    * then each entry's waves as contiguous int16 samples
+
+    Make a bundle from a directory of WAVs with `WavetableBundle.write`.
+    On a host with `mmap`, ``use_mmap=True`` maps the file and `samples`
+    returns arrays backed by the mapping, without copying.
+
+    :param str filepath: path to the bundle file
+    :param bool use_mmap: memory-map the file, if mmap is available
+    """
+
+    MAGIC = b"SYWT"
+    VERSION = 1
+    HEADER = "<4sHH"
+    ENTRY = "<16sHHII"
+
+    def __init__(self, filepath, use_mmap=False):
+        self.f = open(filepath, "rb")  # pylint: disable=consider-using-with
+        magic, version, count = struct.unpack(
+            self.HEADER, self.f.read(struct.calcsize(self.HEADER))
+        )
+        if magic != self.MAGIC or version != self.VERSION:
+            self.f.close()
+            raise ValueError("not a wavetable bundle")
+        entry_size = struct.calcsize(self.ENTRY)
+        index = self.f.read(entry_size * count)
+        self.entries = {}  # name -> (num_waves, wave_len, sample_rate, offset)
+        for i in range(count):
+            name, num_waves, wave_len, rate, offset = struct.unpack_from(
+                self.ENTRY, index, i * entry_size
+            )
+            name = name.rstrip(b"\0").decode()
+            self.entries[name] = (num_waves, wave_len, rate, offset)
+        self.mm = None
+        if use_mmap and mmap is not None:
+            self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def names(self):
+        """Return the names of the wavetables in the bundle"""
+        return list(self.entries)
+
+    def open(self, name):
+        """Return a `BundleEntry` wave reader for wavetable `name`"""
+        if name not in self.entries:
+            raise KeyError(name)
+        return BundleEntry(self, *self.entries[name])
+
+    def samples(self, name):
+        """Return all of wavetable `name` as one int16 array.
+        If memory-mapped, the array uses the mapping and is not a copy,
+        so drop it before `close()` to let the mapping be closed."""
+        num_waves, wave_len, _, offset = self.entries[name]
+        count = num_waves * wave_len
+        if self.mm is not None:
+            return np.frombuffer(self.mm, dtype=np.int16, count=count, offset=offset)
+        self.f.seek(offset)
+        return np.frombuffer(self.f.read(count * 2), dtype=np.int16)
+
+    def close(self):
+        """Close the bundle file. A mapping still used by arrays from
+        `samples()` is left open, to be freed with the last of them."""
+        if self.mm is not None:
+            try:
+                self.mm.close()
+            except BufferError:
+                pass  # arrays still export it, GC closes it after them
+            self.mm = None
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def write(cls, filepath, wav_dir, wave_len=256):
+        """
+        Pack every ``.wav`` file in `wav_dir` into a bundle at `filepath`,
+        named by file name without extension (up to 16 bytes). WAVs are
+        converted to mono int16 and cut to a whole number of waves.
+        Returns the list of names written. Raises `ValueError` if two
+        names are the same once cut to 16 bytes.
+        """
+        from synth_tools.waves import (  # pylint: disable=import-outside-toplevel
+            WavReader,
+        )
+
+        fnames = sorted(f for f in os.listdir(wav_dir) if f.lower().endswith(".wav"))
+        paths = [wav_dir.rstrip("/") + "/" + f for f in fnames]
+        names = [f[:-4].encode()[:16] for f in fnames]
+        for i, name in enumerate(names):
+            if name in names[:i]:
+                raise ValueError("duplicate wavetable name: %s" % name.decode())
+        entries = []
+        offset = struct.calcsize(cls.HEADER) + struct.calcsize(cls.ENTRY) * len(paths)
+        for path in paths:
+            with WavReader(path, 1) as reader:
+                num_waves = reader.nframes // wave_len
+                entries.append((num_waves, reader.sample_rate, offset))
+            offset += num_waves * wave_len * 2
+        with open(filepath, "wb") as f:
+            f.write(struct.pack(cls.HEADER, cls.MAGIC, cls.VERSION, len(paths)))
+            for name, (num_waves, rate, offset) in zip(names, entries):
+                f.write(struct.pack(cls.ENTRY, name, num_waves, wave_len, rate, offset))
+            for path, (num_waves, _, _) in zip(paths, entries):
+                with WavReader(path, wave_len) as reader:
+                    for chunk in reader.chunks(end=num_waves * wave_len):
+                        f.write(chunk.tobytes())
+        return [name.decode() for name in names]
+
+
+class BundleEntry:
+    """
+    One wavetable in a `WavetableBundle`, readable like an open
+    ``adafruit_wave`` file of 16-bit mono samples, so `Wavetable` can use
+    it directly. It shares the bundle's file, so closing it does nothing.
+    """
+
+    def __init__(self, bundle, num_waves, wave_len, sample_rate, offset):
+        self.bundle = bundle
+        self.num_waves = num_waves
+        self.wave_len = wave_len
+        self.sample_rate = sample_rate
+        self.offset = offset
+        self.pos = 0
+
+    def getnchannels(self):
+        """Always mono"""
+        return 1
+
+    def getsampwidth(self):
+        """Always 16-bit"""
+        return 2
+
+    def getframerate(self):
+        """Sample rate of the original WAV"""
+        return self.sample_rate
+
+    def getnframes(self):
+        """Number of samples in this wavetable"""
+        return self.num_waves * self.wave_len
+
+    def setpos(self, pos):
+        """Move to sample `pos` for the next `readframes`"""
+        self.pos = pos
+
+    def readframes(self, n):
+        """Read up to `n` samples as bytes, with a single seek"""
+        n = max(0, min(n, self.getnframes() - self.pos))
+        start = self.offset + self.pos * 2
+        self.pos += n
+        if self.bundle.mm is not None:
+            return self.bundle.mm[start : start + n * 2]
+        self.bundle.f.seek(start)
+        return self.bundle.f.read(n * 2)
+
+    def close(self):
+        """Nothing to close, the bundle owns the file"""